@@ -2,15 +2,20 @@
 FastAPI main application for StratMancer
 """
 
+import asyncio
+import importlib
+import json
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 
 from backend.config import settings
+from backend.middleware.asgi import PureASGIMiddleware
 
 # Configure logging first
 logging.basicConfig(
@@ -34,6 +39,14 @@ except ImportError as e:
     logger.warning(f"Security middleware not available: {e}")
     SECURITY_AVAILABLE = False
 
+try:
+    import orjson  # noqa: F401 - ORJSONResponse needs it at render time
+    from fastapi.responses import ORJSONResponse
+    ORJSON_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"orjson not available, using stdlib JSON responses: {e}")
+    ORJSON_AVAILABLE = False
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -53,7 +66,11 @@ async def lifespan(app: FastAPI):
         logger.info(f"Rate limiter initialized (backend: {'redis' if rate_limiter.using_redis else 'memory'})")
     except Exception as e:
         logger.warning(f"Rate limiter initialization failed: {e}")
-    
+
+    # Mount the ML routers in the background so /health binds immediately;
+    # keep a reference so the task is not garbage-collected mid-load
+    app.state.router_load_task = asyncio.create_task(_load_routers())
+
     yield
     
     # Shutdown
@@ -93,13 +110,18 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
 )
 
 # Security middleware (must be first) - optional
 if SECURITY_AVAILABLE:
     app.add_middleware(SecurityMiddleware)
 
+# Compress large JSON bodies (prediction/recommendation payloads);
+# level 5 is the usual speed/ratio sweet spot
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=5)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -149,76 +171,115 @@ async def general_exception_handler(request: Request, exc: Exception):
     )
 
 
-# Include routers - import them safely
+DEFERRED_ROUTER_MODULES = (
+    "predict",
+    "models",
+    "landing",
+    "meta",
+    "recommend",
+    "analysis",
+    "team_optimizer",
+    "admin",
+    "draft_iq_v2",
+)
+
+# Flipped by _load_routers once every deferred router is mounted. The
+# flag is the cheap per-request check in DeferredRouterGuard; the event
+# is the awaitable readiness handle for startup hooks and tests that
+# must not race the background mounting.
+ROUTERS_READY = False
+ROUTERS_READY_EVENT = asyncio.Event()
+
+# Health router is loaded eagerly so the platform health check binds
+# immediately; the ML-heavy routers are deferred to a startup task
 try:
     from backend.api.routers import health
     app.include_router(health.router)
-    logger.info("Health router loaded")
+    logger.info("health router loaded")
 except Exception as e:
     logger.error(f"Failed to load health router: {e}")
 
-try:
-    from backend.api.routers import predict
-    app.include_router(predict.router)
-    logger.info("Predict router loaded")
-except Exception as e:
-    logger.error(f"Failed to load predict router: {e}")
-
-try:
-    from backend.api.routers import models
-    app.include_router(models.router)
-    logger.info("Models router loaded")
-except Exception as e:
-    logger.error(f"Failed to load models router: {e}")
-
-try:
-    from backend.api.routers import landing
-    app.include_router(landing.router)
-    logger.info("Landing router loaded")
-except Exception as e:
-    logger.error(f"Failed to load landing router: {e}")
-
-try:
-    from backend.api.routers import meta
-    app.include_router(meta.router)
-    logger.info("Meta router loaded")
-except Exception as e:
-    logger.error(f"Failed to load meta router: {e}")
-
-try:
-    from backend.api.routers import recommend
-    app.include_router(recommend.router)
-    logger.info("Recommend router loaded")
-except Exception as e:
-    logger.error(f"Failed to load recommend router: {e}")
 
-try:
-    from backend.api.routers import analysis
-    app.include_router(analysis.router)
-    logger.info("Analysis router loaded")
-except Exception as e:
-    logger.error(f"Failed to load analysis router: {e}")
-
-try:
-    from backend.api.routers import team_optimizer
-    app.include_router(team_optimizer.router)
-    logger.info("Team optimizer router loaded")
-except Exception as e:
-    logger.error(f"Failed to load team optimizer router: {e}")
-
-try:
-    from backend.api.routers import admin
-    app.include_router(admin.router)
-    logger.info("Admin router loaded")
-except Exception as e:
-    logger.error(f"Failed to load admin router: {e}")
-
-try:
-    from backend.api.routers import draft_iq_v2
-    app.include_router(draft_iq_v2.router)
-    logger.info("Draft IQ v2 router loaded")
-except Exception as e:
-    logger.error(f"Failed to load Draft IQ v2 router: {e}")
+async def _load_routers():
+    """Import and mount the deferred routers off the startup path.
+
+    The heavy imports (numpy/sklearn/xgboost via the inference stack) run
+    in a worker thread so the event loop keeps serving /health while the
+    process warms up. One module at a time, so a broken router degrades
+    that feature instead of the whole API.
+    """
+    global ROUTERS_READY
+
+    for router_name in DEFERRED_ROUTER_MODULES:
+        try:
+            module = await asyncio.to_thread(
+                importlib.import_module, f"backend.api.routers.{router_name}"
+            )
+            app.include_router(module.router)
+            logger.info(f"{router_name} router loaded")
+        except Exception as e:
+            logger.error(f"Failed to load {router_name} router: {e}")
+
+    # Drop any OpenAPI schema cached during warmup — a /docs or
+    # /openapi.json hit before this point generated one containing only
+    # the health router, and app.openapi() never regenerates on its own
+    app.openapi_schema = None
+
+    ROUTERS_READY = True
+    ROUTERS_READY_EVENT.set()
+    logger.info("All deferred routers loaded")
+
+
+_NOT_READY_BODY = json.dumps(
+    {"detail": "Service starting, ML routers still loading"}
+).encode()
+
+
+class DeferredRouterGuard(PureASGIMiddleware):
+    """Turn 404s into 503 + Retry-After while routers are still loading"""
+
+    async def dispatch(self, scope, receive, send):
+        replaced = False
+
+        async def send_wrapper(message):
+            nonlocal replaced
+            if (
+                message["type"] == "http.response.start"
+                and message["status"] == status.HTTP_404_NOT_FOUND
+                and not ROUTERS_READY
+            ):
+                replaced = True
+                # Keep the headers inner middleware attached to the 404
+                # (CORS allow-origin/vary in particular, or browsers hide
+                # the 503 behind a CORS error); override only the entity
+                # headers describing the replacement body
+                headers = [
+                    (name, value)
+                    for name, value in message.get("headers", [])
+                    if name.lower() not in (b"content-type", b"content-length", b"retry-after")
+                ]
+                headers += [
+                    (b"content-type", b"application/json"),
+                    (b"retry-after", b"5"),
+                    (b"content-length", str(len(_NOT_READY_BODY)).encode()),
+                ]
+                await send({
+                    "type": "http.response.start",
+                    "status": status.HTTP_503_SERVICE_UNAVAILABLE,
+                    "headers": headers,
+                })
+                return
+            if replaced:
+                # Swallow the original 404 body; emit ours on the final chunk
+                if message["type"] == "http.response.body" and not message.get("more_body"):
+                    await send({"type": "http.response.body", "body": _NOT_READY_BODY})
+                return
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+app.add_middleware(DeferredRouterGuard)
 
 
 # Metrics endpoint - optional
@@ -246,16 +307,23 @@ if METRICS_AVAILABLE:
         return response
 
 
-# Root endpoint
+# Root endpoint; the payload is constant, so serialize it once at import
+_ROOT_PAYLOAD = {
+    "message": "Welcome to StratMancer API",
+    "version": settings.APP_VERSION,
+    "docs": "/docs",
+    "health": "/health"
+}
+_ROOT_BYTES = (
+    orjson.dumps(_ROOT_PAYLOAD) if ORJSON_AVAILABLE
+    else json.dumps(_ROOT_PAYLOAD).encode()
+)
+
+
 @app.get("/", include_in_schema=False)
 async def root():
     """Root endpoint - redirect to docs"""
-    return {
-        "message": "Welcome to StratMancer API",
-        "version": settings.APP_VERSION,
-        "docs": "/docs",
-        "health": "/health"
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 
 if __name__ == "__main__":
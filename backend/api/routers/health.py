@@ -1,13 +1,19 @@
 """
 Health check endpoint - absolute minimal for Railway
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+
+try:
+    import orjson
+    _HEALTH_BYTES = orjson.dumps({"status": "ok"})
+except ImportError:
+    import json
+    _HEALTH_BYTES = json.dumps({"status": "ok"}).encode()
 
 router = APIRouter(tags=["health"])
 
 @router.get("/health")
 @router.get("/healthz")
 async def health_check():
-    """Health check endpoint - returns simple JSON"""
-    return {"status": "ok"}
-
+    """Health check endpoint - returns bytes serialized once at import"""
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
@@ -0,0 +1,38 @@
+"""
+Pure-ASGI middleware base for StratMancer API.
+
+Custom middleware should subclass ``PureASGIMiddleware`` rather than use
+``starlette.middleware.base.BaseHTTPMiddleware`` or ``@app.middleware("http")``
+(which wraps the handler in BaseHTTPMiddleware under the hood).
+BaseHTTPMiddleware rebuilds ``Request``/``Response`` objects and runs a
+task-group handoff per request — measurable overhead that dominates the
+latency of trivial endpoints like the health check. Operating on the raw
+scope/receive/send triple avoids all of that.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PureASGIMiddleware:
+    """
+    Minimal pure-ASGI middleware base.
+
+    Subclasses override :meth:`dispatch`, which only runs for ``http``
+    scopes; websocket/lifespan traffic passes straight through. No
+    Request/Response reconstruction happens unless the subclass opts in.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        await self.dispatch(scope, receive, send)
+
+    async def dispatch(self, scope, receive, send):
+        """Handle one http request; default is pass-through."""
+        await self.app(scope, receive, send)
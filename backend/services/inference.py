@@ -201,14 +201,50 @@ class InferenceService:
         """
         if not self._initialized:
             self.initialize()
-        
+
         # Load model for this ELO
         model, calibrator, calibrator_method, modelcard = self.load_elo_model(elo)
         model_type = modelcard.get('model_type', 'xgb')
-        
+
         # Ensure feature context is created with correct model card metadata
         context = self._ensure_feature_context(elo, modelcard)
-        
+
+        X, named, context, blue_pick_list, red_pick_list = self._assemble_draft_features(
+            elo, patch, blue_picks, red_picks, blue_bans, red_bans, context
+        )
+
+        # Get uncalibrated prediction
+        raw_prob, calibrated_prob = predict_raw_and_calibrated(
+            model,
+            calibrator,
+            calibrator_method,
+            X.reshape(1, -1),
+            model_type,
+        )
+        raw_prob = float(np.clip(raw_prob[0], 0.0, 1.0))
+        calibrated_prob = float(np.clip(calibrated_prob[0], 0.0, 1.0))
+
+        return self._format_prediction(
+            elo, patch, model_type, modelcard, calibrator_method, context,
+            named, raw_prob, calibrated_prob, blue_pick_list, red_pick_list,
+            calibrated_for_ui,
+        )
+
+    def _assemble_draft_features(
+        self,
+        elo: str,
+        patch: str,
+        blue_picks: list,
+        red_picks: list,
+        blue_bans: list,
+        red_bans: list,
+        context: Optional[FeatureContext],
+    ) -> Tuple[np.ndarray, Dict, FeatureContext, list, list]:
+        """Normalize a draft and assemble its feature vector.
+
+        Returns:
+            (X, named_features, context, blue_pick_list, red_pick_list)
+        """
         # Create match-like dictionary for feature assembly
         # Convert positional arrays to champion ID lists (same format as training data)
         def _normalize_pick(value: Any) -> int:
@@ -225,7 +261,7 @@ class InferenceService:
             blue_pick_list.extend([-1] * (5 - len(blue_pick_list)))
         if len(red_pick_list) < 5:
             red_pick_list.extend([-1] * (5 - len(red_pick_list)))
-        
+
         blue_bans_norm = [_normalize_pick(ban) for ban in blue_bans]
         red_bans_norm = [_normalize_pick(ban) for ban in red_bans]
 
@@ -241,7 +277,7 @@ class InferenceService:
             'champion_stats': [],  # Not needed for prediction
             'derived_features': {}  # Will be computed
         }
-        
+
         # Assemble features - FIX CONTEXT CREATION
         try:
             # Create a proper feature context that matches the model's training
@@ -249,7 +285,7 @@ class InferenceService:
                 # Fallback: create context manually to match model card
                 feature_flags = FeatureFlags(
                     use_embeddings=True,
-                    use_matchups=True, 
+                    use_matchups=True,
                     use_synergy=True,
                     ban_context=True,
                     pick_order=False
@@ -262,7 +298,7 @@ class InferenceService:
                     flags=feature_flags
                 )
                 logger.info(f"Created fallback context: mode={context.mode}, flags={context.flags.__dict__}")
-            
+
             X, named = assemble_features(
                 match_data,
                 elo.upper(),
@@ -274,18 +310,25 @@ class InferenceService:
         except Exception as e:
             logger.error(f"Feature assembly failed: {e}")
             raise ValueError(f"Failed to assemble features: {str(e)}")
-        
-        # Get uncalibrated prediction
-        raw_prob, calibrated_prob = predict_raw_and_calibrated(
-            model,
-            calibrator,
-            calibrator_method,
-            X.reshape(1, -1),
-            model_type,
-        )
-        raw_prob = float(np.clip(raw_prob[0], 0.0, 1.0))
-        calibrated_prob = float(np.clip(calibrated_prob[0], 0.0, 1.0))
-        
+
+        return X, named, context, blue_pick_list, red_pick_list
+
+    def _format_prediction(
+        self,
+        elo: str,
+        patch: str,
+        model_type: str,
+        modelcard: Dict,
+        calibrator_method: str,
+        context: Optional[FeatureContext],
+        named: Dict,
+        raw_prob: float,
+        calibrated_prob: float,
+        blue_pick_list: list,
+        red_pick_list: list,
+        calibrated_for_ui: bool,
+    ) -> Dict[str, Any]:
+        """Turn one draft's probabilities into the API response dict."""
         # DEBUG: Log the raw model output to understand what's happening
         logger.info(f"MODEL DEBUG: Raw prob={raw_prob:.6f}, Calibrated prob={calibrated_prob:.6f}, Model type={model_type}")
 
@@ -361,6 +404,73 @@ class InferenceService:
         
         return result
     
+    def predict_draft_batch(self, requests: list) -> list:
+        """
+        Make draft predictions for several requests in one model pass.
+
+        Requests are grouped by ELO, each group's feature vectors are
+        stacked into one matrix, and every model runs predict once per
+        group instead of once per draft — the per-call Python and numpy
+        overhead dwarfs the cost of the extra rows.
+
+        Args:
+            requests: Dicts carrying the predict_draft keyword arguments
+                (elo, patch, blue_picks, red_picks, blue_bans, red_bans,
+                and optionally calibrated_for_ui)
+
+        Returns:
+            Prediction dictionaries in input order
+        """
+        if not self._initialized:
+            self.initialize()
+
+        groups: Dict[str, list] = {}
+        for i, request in enumerate(requests):
+            groups.setdefault(request['elo'], []).append(i)
+
+        results: list = [None] * len(requests)
+        for elo, indices in groups.items():
+            model, calibrator, calibrator_method, modelcard = self.load_elo_model(elo)
+            model_type = modelcard.get('model_type', 'xgb')
+            context = self._ensure_feature_context(elo, modelcard)
+
+            assembled = [
+                self._assemble_draft_features(
+                    elo,
+                    requests[i]['patch'],
+                    requests[i]['blue_picks'],
+                    requests[i]['red_picks'],
+                    requests[i].get('blue_bans', []),
+                    requests[i].get('red_bans', []),
+                    context,
+                )
+                for i in indices
+            ]
+
+            X = np.stack([row[0] for row in assembled])
+            raw_probs, calibrated_probs = predict_raw_and_calibrated(
+                model, calibrator, calibrator_method, X, model_type
+            )
+
+            for row, i in enumerate(indices):
+                _, named, row_context, blue_pick_list, red_pick_list = assembled[row]
+                results[i] = self._format_prediction(
+                    elo,
+                    requests[i]['patch'],
+                    model_type,
+                    modelcard,
+                    calibrator_method,
+                    row_context,
+                    named,
+                    float(np.clip(raw_probs[row], 0.0, 1.0)),
+                    float(np.clip(calibrated_probs[row], 0.0, 1.0)),
+                    blue_pick_list,
+                    red_pick_list,
+                    requests[i].get('calibrated_for_ui', True),
+                )
+
+        return results
+
     def predict_draft_with_roles(
         self,
         elo: str,
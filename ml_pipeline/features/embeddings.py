@@ -19,6 +19,10 @@ def load_embeddings(
     """
     Load co-pick/ban embeddings for a given elo group.
 
+    The array is memory-mapped, so repeated loads across sibling processes
+    (e.g. per-ELO retrains) share pages via the OS cache instead of each
+    reading the full file into RAM.
+
     Returns ``None`` when the asset is unavailable.
     """
     key = (elo_group.lower(), assets_dir)
@@ -30,7 +34,7 @@ def load_embeddings(
         EMBEDDING_CACHE[key] = None
         return None
 
-    embeddings = np.load(path)
+    embeddings = np.load(path, mmap_mode='r')
     EMBEDDING_CACHE[key] = embeddings
     return embeddings
 
@@ -11,7 +11,7 @@ import numpy as np
 
 from .synergy import ROLES
 
-MATCHUP_CACHE: Dict[Tuple[str, str], Dict[str, np.ndarray]] = {}
+MATCHUP_CACHE: Dict[Tuple[str, str, str], Dict[str, np.ndarray]] = {}
 
 
 def load_matchup_matrices(
@@ -26,7 +26,7 @@ def load_matchup_matrices(
     in [-0.2, 0.2] from the perspective of the row champion versus the
     column champion.
     """
-    key = (elo_group.lower(), patch)
+    key = (elo_group.lower(), patch, assets_dir)
     if key in MATCHUP_CACHE:
         return MATCHUP_CACHE[key]
 
@@ -35,10 +35,12 @@ def load_matchup_matrices(
         MATCHUP_CACHE[key] = {}
         return {}
 
-    data = np.load(path)
+    # Compressed .npz cannot be memory-mapped; decompress each role matrix
+    # once and close the archive so the file handle is not held open
     matrices: Dict[str, np.ndarray] = {}
-    for role in data.files:
-        matrices[role] = data[role]
+    with np.load(path) as data:
+        for role in data.files:
+            matrices[role] = np.asarray(data[role])
 
     MATCHUP_CACHE[key] = matrices
     return matrices
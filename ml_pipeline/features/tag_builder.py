@@ -44,7 +44,11 @@ logger = logging.getLogger(__name__)
 
 class ChampionTagBuilder:
     """Builds comprehensive champion tags from data and API"""
-    
+
+    # Bounded concurrency for per-champion Data Dragon fetches
+    FETCH_CONCURRENCY = 20   # max in-flight requests (respects DDragon limits)
+    FETCH_CHUNK_SIZE = 50    # gather in chunks to cap memory
+
     # Default champion tags (heuristic-based, can be overridden)
     DEFAULT_TAGS = {
         'role': 'UNKNOWN',
@@ -101,6 +105,7 @@ class ChampionTagBuilder:
         
         self.region = self.config.get_region()
         self.current_patch = None
+        self.full_patch = None  # Full version string for per-champion CDN URLs
     
     def _load_overrides(self) -> Dict:
         """Load manual overrides from YAML"""
@@ -125,6 +130,7 @@ class ChampionTagBuilder:
                 versions = response.json()
                 patch = versions[0]
                 self.current_patch = '.'.join(patch.split('.')[:2])
+                self.full_patch = patch
                 
                 # Get champion data
                 champ_url = f"https://ddragon.leagueoflegends.com/cdn/{patch}/data/en_US/champion.json"
@@ -138,6 +144,7 @@ class ChampionTagBuilder:
                     champ_data[champ_id] = {
                         'name': info['name'],
                         'id': champ_id,
+                        'ddragon_id': name,  # Key used for per-champion CDN URLs
                         'title': info['title'],
                         'tags': info['tags'],  # e.g., ['Fighter', 'Tank']
                         'partype': info['partype']  # Mana, Energy, etc.
@@ -150,6 +157,50 @@ class ChampionTagBuilder:
             logger.error(f"Failed to fetch champion data: {e}")
             return {}
     
+    async def fetch_champion_details(self, champ_data: Dict):
+        """
+        Enrich champion data with per-champion Data Dragon details.
+
+        Instead of awaiting one request per champion sequentially (~N x RTT),
+        fetches run concurrently under a bounded semaphore
+        (FETCH_CONCURRENCY in flight) and are gathered in chunks of
+        FETCH_CHUNK_SIZE to cap memory (~N / FETCH_CONCURRENCY x RTT).
+        """
+        if not champ_data or not self.full_patch:
+            return
+
+        semaphore = asyncio.Semaphore(self.FETCH_CONCURRENCY)
+
+        async def fetch_one(client: httpx.AsyncClient, champ_id: int, ddragon_id: str):
+            url = (
+                f"https://ddragon.leagueoflegends.com/cdn/{self.full_patch}"
+                f"/data/en_US/champion/{ddragon_id}.json"
+            )
+            async with semaphore:
+                try:
+                    response = await client.get(url, timeout=10)
+                    data = response.json()
+                    champ_data[champ_id]['info'] = data['data'][ddragon_id].get('info', {})
+                except Exception as e:
+                    logger.debug(f"Failed to fetch details for {ddragon_id}: {e}")
+
+        items = [
+            (champ_id, info['ddragon_id'])
+            for champ_id, info in champ_data.items()
+            if info.get('ddragon_id')
+        ]
+
+        async with httpx.AsyncClient() as client:
+            for start in range(0, len(items), self.FETCH_CHUNK_SIZE):
+                chunk = items[start:start + self.FETCH_CHUNK_SIZE]
+                await asyncio.gather(*[
+                    fetch_one(client, champ_id, ddragon_id)
+                    for champ_id, ddragon_id in chunk
+                ])
+
+        enriched = sum(1 for info in champ_data.values() if 'info' in info)
+        logger.info(f"Fetched per-champion details for {enriched}/{len(champ_data)} champions")
+
     def scan_data_files(self):
         """Scan data directory for champion IDs and usage patterns"""
         logger.info(f"Scanning data directory: {self.data_dir}")
@@ -307,7 +358,12 @@ class ChampionTagBuilder:
             poke = 2
             frontline = 1
             scaling_early = 2
-        
+
+        # Per-champion difficulty rating (0-10) refines the class-based skill cap
+        difficulty = champ_info.get('info', {}).get('difficulty')
+        if difficulty is not None:
+            skill_cap = 1 if difficulty <= 3 else (2 if difficulty <= 6 else 3)
+
         return {
             'role': role,
             'damage': damage,
@@ -330,7 +386,10 @@ class ChampionTagBuilder:
         
         # Fetch champion data from API
         champ_data = await self.fetch_champion_data()
-        
+
+        # Enrich with per-champion details (bounded concurrent fetches)
+        await self.fetch_champion_details(champ_data)
+
         # Scan local data
         self.scan_data_files()
         
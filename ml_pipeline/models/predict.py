@@ -151,6 +151,13 @@ def apply_calibrator(calibrator: Any, method: str, probs: np.ndarray) -> np.ndar
         return probs
     if method == 'isotonic':
         return calibrator.predict(probs)
+    if method == 'platt_shift':
+        # Composed calibrator: (base_calibrator, base_method, logit_bias)
+        base_calibrator, base_method, bias = calibrator
+        calibrated = apply_calibrator(base_calibrator, base_method, probs)
+        clipped = np.clip(calibrated, 1e-6, 1.0 - 1e-6)
+        logits = np.log(clipped / (1.0 - clipped)) + bias
+        return 1.0 / (1.0 + np.exp(-logits))
     if hasattr(calibrator, 'predict_proba'):
         return calibrator.predict_proba(probs.reshape(-1, 1))[:, 1]
     return calibrator.predict(probs.reshape(-1, 1))
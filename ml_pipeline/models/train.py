@@ -14,6 +14,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+from scipy import sparse
 from sklearn.model_selection import train_test_split, StratifiedKFold
 from sklearn.linear_model import LogisticRegression
 from sklearn.isotonic import IsotonicRegression
@@ -101,18 +102,22 @@ def load_data_for_elo_group(
     history_index: Optional[HistoryIndex] = None,
     feature_context: Optional[FeatureContext] = None,
     feature_mode: str = "basic",
-) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    as_sparse: bool = True,
+) -> Tuple[Any, np.ndarray, List[str]]:
     """
     Load and assemble features for an ELO group.
-    
+
     Args:
         elo_group: 'low', 'mid', or 'high'
         data_dir: Directory containing match data
         feature_map: Feature map (loaded if None)
         history_index: History index (loaded if None)
-    
+        as_sparse: Return X as scipy CSR (default). The role/ban one-hots make
+            the matrix >98% zeros; XGBoost and LogisticRegression consume CSR
+            directly, cutting memory and histogram work dramatically.
+
     Returns:
-        X: Feature matrix
+        X: Feature matrix (CSR when as_sparse, else dense ndarray)
         y: Labels (1=blue win, 0=red win)
         match_ids: List of match IDs
     """
@@ -172,8 +177,17 @@ def load_data_for_elo_group(
     
     if not X_list:
         raise ValueError(f"No data loaded for ELO group {elo_group}")
-    
-    X = np.vstack(X_list)
+
+    if as_sparse:
+        # Convert in chunks so the full dense matrix never materializes
+        chunk_size = 10_000
+        parts = []
+        while X_list:
+            block, X_list = X_list[:chunk_size], X_list[chunk_size:]
+            parts.append(sparse.csr_matrix(np.vstack(block).astype(np.float32)))
+        X = sparse.vstack(parts, format='csr')
+    else:
+        X = np.vstack(X_list)
     y = np.array(y_list)
     
     logger.info(f"Loaded {len(y)} matches for {elo_group} group")
@@ -183,6 +197,11 @@ def load_data_for_elo_group(
     return X, y, match_ids
 
 
+def _densify(X: Any) -> np.ndarray:
+    """Convert a sparse matrix to a dense array (the NN path needs dense input)."""
+    return X.toarray() if sparse.issparse(X) else X
+
+
 def train_xgboost(
     X_train: np.ndarray, 
     y_train: np.ndarray,
@@ -370,9 +389,15 @@ def train_calibrator(
     y_pred_proba: np.ndarray,
     method: str = "auto",
 ):
-    """Fit a probability calibrator using Platt scaling or isotonic regression."""
+    """
+    Fit a probability calibrator using Platt scaling or isotonic regression.
+
+    Isotonic is high-variance on small OOF sets and its PAV fit is
+    O(N log N); Platt is a two-parameter O(N) fit, so it is preferred
+    unless there is enough data for isotonic to be stable.
+    """
     if method == "auto":
-        method = "isotonic" if len(y_true) >= 10_000 else "platt"
+        method = "isotonic" if len(y_true) >= 20_000 else "platt"
 
     logger.info("Training %s calibrator...", method)
 
@@ -381,7 +406,8 @@ def train_calibrator(
         calibrator.fit(y_pred_proba, y_true)
         calibrated_probs = calibrator.predict(y_pred_proba)
     else:
-        platt = LogisticRegression(max_iter=1000)
+        # lbfgs converges in a handful of iterations on a single feature
+        platt = LogisticRegression(solver='lbfgs', max_iter=50)
         platt.fit(y_pred_proba.reshape(-1, 1), y_true)
         calibrator = platt
         calibrated_probs = platt.predict_proba(y_pred_proba.reshape(-1, 1))[:, 1]
@@ -400,6 +426,14 @@ def apply_calibrator(calibrator: Any, method: str, probs: np.ndarray) -> np.ndar
         return probs
     if method == "isotonic":
         return calibrator.predict(probs)
+    if method == "platt_shift":
+        # Composed calibrator: (base_calibrator, base_method, logit_bias).
+        # Applies the base calibration, then a constant shift in logit space.
+        base_calibrator, base_method, bias = calibrator
+        calibrated = apply_calibrator(base_calibrator, base_method, probs)
+        clipped = np.clip(calibrated, 1e-6, 1.0 - 1e-6)
+        logits = np.log(clipped / (1.0 - clipped)) + bias
+        return 1.0 / (1.0 + np.exp(-logits))
     return calibrator.predict_proba(probs.reshape(-1, 1))[:, 1]
 
 
@@ -665,6 +699,7 @@ def train_model(
         X_tr, X_val, y_tr, y_val = train_test_split(
             X_train_full, y_train_full, test_size=0.2, random_state=42, stratify=y_train_full
         )
+        X_tr, X_val = _densify(X_tr), _densify(X_val)
         model = train_nn(X_tr, y_tr, X_val, y_val, params)
         model.eval()
         device = next(model.parameters()).device
@@ -690,7 +725,7 @@ def train_model(
         model.eval()
         device = next(model.parameters()).device
         with torch.no_grad():
-            y_test_pred_raw = model(torch.FloatTensor(X_test).to(device)).cpu().numpy()
+            y_test_pred_raw = model(torch.FloatTensor(_densify(X_test)).to(device)).cpu().numpy()
     else:
         y_test_pred_raw = model.predict_proba(X_test)[:, 1]
 
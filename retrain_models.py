@@ -3,11 +3,13 @@ Retraining script that ensures models predict 55-60% blue win rate.
 Uses sample weighting and calibration adjustments to bias predictions appropriately.
 """
 import argparse
+import gc
 import logging
+import os
 import sys
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Set, Tuple
 import numpy as np
 import pandas as pd
 
@@ -24,7 +26,6 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import (
     accuracy_score, roc_auc_score, log_loss, brier_score_loss
 )
-from sklearn.isotonic import IsotonicRegression
 from sklearn.linear_model import LogisticRegression
 
 # XGBoost
@@ -34,6 +35,20 @@ try:
 except ImportError:
     HAS_XGB = False
 
+# threadpoolctl ships with scikit-learn but guard anyway
+try:
+    from threadpoolctl import threadpool_limits
+    HAS_THREADPOOLCTL = True
+except ImportError:
+    HAS_THREADPOOLCTL = False
+
+# orjson serializes numpy natively and much faster than stdlib json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -44,6 +59,61 @@ def calculate_blue_win_rate(y: np.ndarray, y_pred: np.ndarray, threshold: float
     return float(np.mean(y_pred_binary))
 
 
+def _logit(p: float) -> float:
+    """Log-odds of a probability."""
+    return float(np.log(p / (1.0 - p)))
+
+
+def _thread_limits(nthread: int):
+    """Cap BLAS/OpenMP pools so sklearn and XGBoost don't oversubscribe cores."""
+    if HAS_THREADPOOLCTL:
+        return threadpool_limits(limits=nthread)
+    from contextlib import nullcontext
+    return nullcontext()
+
+
+def _to_native_xgb_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert sklearn-wrapper XGBoost params to native xgb.train/xgb.cv params."""
+    native = {
+        k: v for k, v in params.items()
+        if k not in ("n_estimators", "use_label_encoder", "early_stopping_rounds")
+    }
+    if "n_jobs" in native:
+        native["nthread"] = native.pop("n_jobs")
+    if "random_state" in native:
+        native["seed"] = native.pop("random_state")
+    return native
+
+
+def _write_modelcard(card_file: Path, modelcard: Dict[str, Any]):
+    """
+    Serialize a modelcard to a temp file and atomically replace the target.
+
+    orjson handles numpy scalars natively and encodes several times faster
+    than stdlib json; os.replace means a crash mid-write can no longer leave
+    a truncated card behind.
+    """
+    tmp_file = card_file.with_suffix('.json.tmp')
+    if HAS_ORJSON:
+        payload = orjson.dumps(
+            modelcard, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+        )
+        with open(tmp_file, 'wb') as fh:
+            fh.write(payload)
+    else:
+        with open(tmp_file, 'w', encoding='utf-8') as fh:
+            json.dump(modelcard, fh, indent=2)
+    os.replace(tmp_file, card_file)
+
+
+def _list_asset_entries(assets_dir: str) -> Set[str]:
+    """List filenames in the assets directory once for availability checks."""
+    try:
+        return set(os.listdir(assets_dir))
+    except OSError:
+        return set()
+
+
 def adjust_calibrator_for_target_wr(
     calibrator: Any,
     calibrator_method: str,
@@ -81,23 +151,26 @@ def adjust_calibrator_for_target_wr(
     
     # Check if we're close to target
     new_wr = calculate_blue_win_rate(y_true, adjusted_probs)
-    
-    # If still not close enough, fit a new isotonic calibrator on adjusted data
+
+    # If still not close enough, compose a closed-form Platt shift: a single
+    # logit bias moves the mean prediction to the target in O(N) without
+    # refitting isotonic on the full OOF set. The shift is monotonic, so
+    # ranking metrics (AUC) are preserved exactly.
     if abs(new_wr - target_blue_wr) > 0.02:
-        logger.info(f"Fitting adjusted calibrator to achieve {target_blue_wr:.3f} win rate...")
-        
-        # Fit isotonic regression to map calibrated_probs to adjusted_probs
-        adjusted_calibrator = IsotonicRegression(out_of_bounds='clip')
-        adjusted_calibrator.fit(calibrated_probs, adjusted_probs)
-        
+        logger.info(f"Applying Platt shift to achieve {target_blue_wr:.3f} win rate...")
+
+        mean_prob = float(np.clip(np.mean(calibrated_probs), 1e-6, 1.0 - 1e-6))
+        bias = _logit(target_blue_wr) - _logit(mean_prob)
+        shifted_calibrator = (calibrator, calibrator_method, bias)
+
         # Verify the adjustment
-        test_adjusted = adjusted_calibrator.predict(calibrated_probs)
+        test_adjusted = apply_calibrator(shifted_calibrator, "platt_shift", y_pred.copy())
         final_wr = calculate_blue_win_rate(y_true, test_adjusted)
-        
-        logger.info(f"Adjusted blue win rate: {final_wr:.3f}")
-        
-        return adjusted_calibrator, "isotonic", test_adjusted
-    
+
+        logger.info(f"Adjusted blue win rate: {final_wr:.3f} (logit bias {bias:+.4f})")
+
+        return shifted_calibrator, "platt_shift", test_adjusted
+
     return calibrator, calibrator_method, adjusted_probs
 
 
@@ -112,14 +185,17 @@ def train_model_with_blue_bias(
     target_blue_wr: float = 0.60,  # 60% (blue side favored)
     cv_folds: int = 5,
     params: Optional[Dict] = None,
+    asset_entries: Optional[Set[str]] = None,
 ) -> Dict[str, Any]:
     """
     Train model with bias adjustment to achieve target blue win rate.
-    
+
     Args:
         elo_group: ELO group ('low', 'mid', 'high')
         model_type: Model type ('xgb', 'logreg', 'nn')
         target_blue_wr: Target blue win rate (default: 0.60 = 60%)
+        asset_entries: Pre-listed filenames in assets_dir (avoids re-scanning
+            the directory per call; computed here if not provided)
         ... other params same as train_model
     
     Returns:
@@ -137,13 +213,21 @@ def train_model_with_blue_bias(
     if history_idx_path.exists():
         history_index.load(str(history_idx_path))
     
-    assets_path = Path(assets_dir)
     flags = feature_flags or FeatureFlags()
     effective_mode = feature_mode
     
-    priors_available = any(assets_path.glob(f"priors_{elo_group}_*.json"))
-    matchups_available = any(assets_path.glob(f"matchups_{elo_group}_*.npz"))
-    embeddings_available = (assets_path / f"embeddings_{elo_group}.npy").exists()
+    # A single directory listing replaces the per-call globs; on slow
+    # filesystems (NFS, S3 FUSE) each glob re-traverses the directory.
+    if asset_entries is None:
+        asset_entries = _list_asset_entries(assets_dir)
+
+    priors_available = any(
+        n.startswith(f"priors_{elo_group}_") and n.endswith(".json") for n in asset_entries
+    )
+    matchups_available = any(
+        n.startswith(f"matchups_{elo_group}_") and n.endswith(".npz") for n in asset_entries
+    )
+    embeddings_available = f"embeddings_{elo_group}.npy" in asset_entries
     
     if feature_mode == "rich" and not all([priors_available, matchups_available, embeddings_available]):
         logger.warning("Required assets missing for rich mode. Falling back to basic features.")
@@ -212,44 +296,65 @@ def train_model_with_blue_bias(
         # Fit with sample weights using cross-validation
         from sklearn.model_selection import StratifiedKFold
         skf = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=42)
-        
-        oof_preds = np.zeros(len(y_train_full), dtype=np.float32)
-        fold_iters = []
-        
-        for train_idx, val_idx in skf.split(X_train_full, y_train_full):
-            X_tr, X_val = X_train_full[train_idx], X_train_full[val_idx]
-            y_tr, y_val = y_train_full[train_idx], y_train_full[val_idx]
-            weights_tr = sample_weights[train_idx]
-            
-            model_params = best_params.copy()
-            model_params['early_stopping_rounds'] = 50
-            
-            model = xgb.XGBClassifier(**model_params)
-            model.fit(
-                X_tr, y_tr,
-                sample_weight=weights_tr,
-                eval_set=[(X_val, y_val)],
-                verbose=False
+
+        # xgb.cv runs all folds natively on one shared DMatrix (no per-fold
+        # sklearn wrapper construction or fancy-indexed matrix copies);
+        # explicit fold indices let us pull out-of-fold predictions from each
+        # fold booster after training.
+        folds = list(skf.split(X_train_full, y_train_full))
+
+        # Folds run serially, so each fit may use the full core budget; pinning
+        # it explicitly keeps XGBoost's OpenMP pool and sklearn's BLAS pool
+        # from stacking threads on the same cores.
+        nthread = os.cpu_count() or 1
+        best_params['n_jobs'] = nthread
+
+        dtrain = xgb.DMatrix(X_train_full, label=y_train_full, weight=sample_weights)
+        native_params = _to_native_xgb_params(best_params)
+        # Probabilities only need ~3 decimal digits for calibration fitting;
+        # float16 halves cache pressure while the calibration sweep runs
+        oof_preds = np.zeros(len(y_train_full), dtype=np.float16)
+
+        class _OOFPredictions(xgb.callback.TrainingCallback):
+            """Capture per-fold validation predictions at the best iteration."""
+
+            def after_training(self, model):
+                for (_, val_idx), cvpack in zip(folds, model.cvfolds):
+                    best_iter = getattr(cvpack.bst, "best_iteration", None)
+                    iteration_range = (0, best_iter + 1) if best_iter is not None else (0, 0)
+                    oof_preds[val_idx] = cvpack.bst.predict(
+                        cvpack.dtest, iteration_range=iteration_range
+                    ).astype(np.float16)
+                return model
+
+        with _thread_limits(nthread):
+            cv_result = xgb.cv(
+                native_params,
+                dtrain,
+                num_boost_round=best_params.get('n_estimators', 500),
+                folds=folds,
+                early_stopping_rounds=50,
+                as_pandas=False,
+                callbacks=[_OOFPredictions()],
             )
-            
-            preds = model.predict_proba(X_val)[:, 1]
-            oof_preds[val_idx] = preds.astype(np.float32)
-            fold_iters.append(getattr(model, "best_iteration", best_params["n_estimators"]))
-        
-        best_n_estimators = int(np.mean(fold_iters)) if fold_iters else best_params["n_estimators"]
+        del dtrain
+
+        best_n_estimators = int(np.argmin(cv_result['test-logloss-mean'])) + 1
         final_model_params = best_params.copy()
         final_model_params['n_estimators'] = best_n_estimators
         
         final_model = xgb.XGBClassifier(**final_model_params)
-        final_model.fit(
-            X_train_full, y_train_full,
-            sample_weight=sample_weights,
-            eval_set=[(X_train_full, y_train_full)],
-            verbose=False
-        )
+        with _thread_limits(nthread):
+            final_model.fit(
+                X_train_full, y_train_full,
+                sample_weight=sample_weights,
+                eval_set=[(X_train_full, y_train_full)],
+                verbose=False
+            )
         
-        calibrator, calibrator_method, _ = train_calibrator(y_train_full, oof_preds)
-        y_val_pred_proba = oof_preds
+        # Upcast at the boundary; sklearn's calibrators expect float32/64 input
+        y_val_pred_proba = oof_preds.astype(np.float32)
+        calibrator, calibrator_method, _ = train_calibrator(y_train_full, y_val_pred_proba)
         
     elif model_type == "logreg":
         # For logistic regression, use class weights
@@ -281,14 +386,15 @@ def train_model_with_blue_bias(
         
     else:  # Neural Network
         # Use weighted loss for NN
-        from ml_pipeline.models.train import train_nn
+        from ml_pipeline.models.train import train_nn, _densify
         import torch
         import torch.nn as nn
-        
+
         X_tr, X_val, y_tr, y_val = train_test_split(
             X_train_full, y_train_full, test_size=0.2, random_state=42, stratify=y_train_full
         )
-        
+        X_tr, X_val = _densify(X_tr), _densify(X_val)
+
         # Use class weights in loss function
         device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         pos_weight = torch.tensor([target_blue_wr / (1 - target_blue_wr)]).to(device)
@@ -306,7 +412,19 @@ def train_model_with_blue_bias(
     calibrator, calibrator_method, adjusted_probs = adjust_calibrator_for_target_wr(
         calibrator, calibrator_method, y_train_full, y_val_pred_proba, target_blue_wr
     )
-    
+
+    # Free the training matrices before the pickle/evaluate tail; only the
+    # hold-out split is still needed below. Capture the modelcard fields that
+    # reference them first.
+    n_features = X.shape[1]
+    train_size = len(y_train_full)
+    del X, y, X_train_full, y_train_full, y_val_pred_proba, adjusted_probs
+    if model_type == "xgb":
+        del sample_weights, oof_preds
+    else:
+        del X_tr, X_val, y_tr, y_val
+    gc.collect()
+
     # Save model and calibrator
     from datetime import datetime
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -327,12 +445,15 @@ def train_model_with_blue_bias(
         model.eval()
         device = next(model.parameters()).device
         with torch.no_grad():
-            y_test_pred_raw = model(torch.FloatTensor(X_test).to(device)).cpu().numpy()
+            y_test_pred_raw = model(torch.FloatTensor(_densify(X_test)).to(device)).cpu().numpy()
     else:
         y_test_pred_raw = final_model.predict_proba(X_test)[:, 1] if model_type == "xgb" else model.predict_proba(X_test)[:, 1]
     
     y_test_pred_cal = apply_calibrator(calibrator, calibrator_method, y_test_pred_raw.copy())
-    
+
+    del X_test
+    gc.collect()
+
     # Calculate metrics including blue win rate
     from ml_pipeline.models.train import expected_calibration_error
     
@@ -362,25 +483,21 @@ def train_model_with_blue_bias(
     logger.info(f"Brier: {metrics['brier_raw']:.4f} -> {metrics['brier_calibrated']:.4f}")
     logger.info("=" * 70)
     
-    # Create model card
-    serializable_params = {}
-    if model_type == "xgb" and best_params:
-        serializable_params = {
-            k: (float(v) if isinstance(v, np.floating) else v)
-            for k, v in best_params.items()
-        }
-    elif params:
+    # Create model card (orjson serializes numpy scalars itself; the coercion
+    # pass is only needed for the stdlib json fallback)
+    serializable_params = best_params if model_type == "xgb" else (params or {})
+    if not HAS_ORJSON:
         serializable_params = {
             k: (float(v) if isinstance(v, np.floating) else v)
-            for k, v in params.items()
+            for k, v in serializable_params.items()
         }
-    
+
     modelcard = {
         "elo": elo_group,
         "model_type": model_type,
         "timestamp": datetime.now().isoformat(),
-        "features": X.shape[1],
-        "train_size": len(y_train_full),
+        "features": n_features,
+        "train_size": train_size,
         "test_size": len(y_test),
         "calibrated": True,
         "calibrator_method": calibrator_method,
@@ -395,9 +512,8 @@ def train_model_with_blue_bias(
     
     card_path = Path("ml_pipeline/models/modelcards")
     card_path.mkdir(parents=True, exist_ok=True)
-    with open(card_path / f"modelcard_{elo_group}_{timestamp}.json", "w", encoding="utf-8") as fh:
-        json.dump(modelcard, fh, indent=2)
-    
+    _write_modelcard(card_path / f"modelcard_{elo_group}_{timestamp}.json", modelcard)
+
     return {
         "model": final_model if model_type == "xgb" else model,
         "calibrator": calibrator,
@@ -419,6 +535,7 @@ def retrain_all_elos(
 ) -> Dict[str, Dict]:
     """Retrain all ELO groups with blue win rate bias."""
     results = {}
+    asset_entries = _list_asset_entries(assets_dir)
     for group in ["low", "mid", "high"]:
         try:
             result = train_model_with_blue_bias(
@@ -430,8 +547,17 @@ def retrain_all_elos(
                 feature_mode=feature_mode,
                 target_blue_wr=target_blue_wr,
                 cv_folds=cv_folds,
+                asset_entries=asset_entries,
             )
-            results[group] = result
+            # Keep only the lightweight summary; retaining each group's model,
+            # calibrator and match-id list would compound peak RSS across groups.
+            results[group] = {
+                "modelcard": result["modelcard"],
+                "metrics": result["metrics"],
+                "calibrator_method": result["calibrator_method"],
+            }
+            del result
+            gc.collect()
         except Exception as exc:
             logger.error(f"Failed to retrain {group} model: {exc}", exc_info=True)
     return results
@@ -26,4 +26,15 @@ if __name__ == "__main__":
     import uvicorn
     import os
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # uvloop + httptools ship with uvicorn[standard]; the string import
+    # form is required for multi-worker mode
+    uvicorn.run(
+        "simple_app:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 2)),
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
+    )
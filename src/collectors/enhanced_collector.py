@@ -2,9 +2,11 @@
 Enhanced match data collector with optimized rate limits for accurate per-rank collection.
 Uses slightly looser rate limits (18/sec, 90/2min) while remaining safe from rate limiting.
 """
+import asyncio
 import logging
 import argparse
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Set, Dict, Optional
 from pathlib import Path
 from tqdm import tqdm
@@ -14,6 +16,7 @@ from ..utils.riot_api_client import RiotAPIClient, RiotAPIError
 from ..utils.rate_limiter import RateLimiter
 from ..transformers.match_transformer import MatchTransformer
 from ..storage.data_storage import DataStorage
+from ..storage.match_cache import MatchCache
 from ..transformers.schema import MatchData
 from .puuid_cache import PUUIDCache
 
@@ -72,155 +75,202 @@ class EnhancedMatchCollector:
             formats=self.config.get_storage_formats()
         )
         self.puuid_cache = PUUIDCache()
-        
+
+        # Incremental saves run here so disk I/O overlaps the next fetch
+        self._save_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='match-save')
+
         self.save_raw = save_raw
         self.current_patch = self.api_client.get_current_patch()
-        
-        # Track processed matches to avoid duplicates
+
+        # Patches accepted by the per-match filter; a single hashed
+        # membership test, and easy to widen to older patches later
+        self._accepted_patches = frozenset({self.current_patch, "unknown"})
+
+        # Track processed matches to avoid duplicates within a run
         self.processed_match_ids: Set[str] = set()
-        
+
+        # Persistent match cache so reruns cost a local lookup, not quota
+        self.match_cache = MatchCache(
+            str(Path(self.config.get_storage_path()) / 'match_cache.sqlite')
+        )
+
         cache_stats = self.puuid_cache.stats()
         logger.info(f"Enhanced match collector initialized for patch {self.current_patch}")
         logger.info(f"Rate limits: {requests_per_second}/sec, {requests_per_2_minutes}/2min")
         logger.info(f"PUUID cache loaded: {cache_stats['total_entries']} entries")
     
-    def collect_for_rank(
-        self, 
-        rank: str, 
+    async def collect_for_rank(
+        self,
+        rank: str,
         target_matches: int = 100,
         min_matches_per_summoner: int = 5,
         max_matches_per_summoner: int = 20
-    ) -> List[MatchData]:
+    ) -> int:
         """
         Collect matches for a specific rank with improved accuracy.
-        
+
+        Match detail fetches are dispatched concurrently in rate-limit-sized
+        batches, so wall time is bounded by the Riot quota instead of by
+        serial round-trips. Matches are flushed to storage in small buffers
+        rather than accumulated for the whole rank, keeping peak memory flat
+        regardless of target size.
+
         Args:
             rank: Rank tier (IRON, BRONZE, ..., CHALLENGER)
             target_matches: Target number of matches to collect
             min_matches_per_summoner: Minimum matches to try per summoner
             max_matches_per_summoner: Maximum matches to collect per summoner
-            
+
         Returns:
-            List of collected MatchData objects
+            Number of matches collected
         """
         rank = rank.upper()
         logger.info(f"Starting enhanced collection for {rank} (target: {target_matches} matches)")
-        
+
         # Get summoners for this rank
-        summoners = self._get_summoners_for_rank(rank, max_summoners=min(200, target_matches // 2))
+        summoners = await self._get_summoners_for_rank(rank, max_summoners=min(200, target_matches // 2))
         logger.info(f"Found {len(summoners)} summoners in {rank}")
-        
+
         if not summoners:
             logger.warning(f"No summoners found for {rank}")
-            return []
-        
-        # Collect matches with better distribution
-        collected_matches = []
+            return 0
+
+        # Collect matches with better distribution; only the unflushed
+        # buffer is held in memory, not the full rank's worth of objects
+        pending_matches: List[MatchData] = []
+        save_futures = []
+        total_collected = 0
         summoners_attempted = 0
         consecutive_failures = 0
         max_consecutive_failures = 10
-        
+
         with tqdm(total=target_matches, desc=f"Collecting {rank}") as pbar:
             for summoner in summoners:
-                if len(collected_matches) >= target_matches:
+                if total_collected >= target_matches:
                     break
-                
+
                 # Safety check for too many consecutive failures
                 if consecutive_failures >= max_consecutive_failures:
                     logger.warning(f"Too many consecutive failures ({consecutive_failures}). Trying next summoner batch...")
                     consecutive_failures = 0
                     continue
-                
+
                 try:
                     # Calculate how many matches we need from this summoner
-                    remaining = target_matches - len(collected_matches)
+                    remaining = target_matches - total_collected
                     matches_to_get = min(max_matches_per_summoner, max(min_matches_per_summoner, remaining))
-                    
-                    matches = self._collect_summoner_matches(
-                        summoner['puuid'], 
+
+                    matches = await self._collect_summoner_matches(
+                        summoner['puuid'],
                         rank,
                         limit=matches_to_get
                     )
-                    
+
                     if matches:
-                        collected_matches.extend(matches)
+                        pending_matches.extend(matches)
+                        total_collected += len(matches)
                         pbar.update(len(matches))
                         consecutive_failures = 0
                         summoners_attempted += 1
-                        
-                        # Save incrementally (every 50 matches)
-                        if len(collected_matches) >= 50 and len(collected_matches) % 50 == 0:
-                            self.storage.save_matches(collected_matches[-50:], rank)
+
+                        # Flush incrementally (every 50 matches); the buffer
+                        # is handed to the save thread and never touched again
+                        if len(pending_matches) >= 50:
+                            save_futures.append(
+                                self._save_pool.submit(self.storage.save_matches, pending_matches, rank)
+                            )
+                            pending_matches = []
                     else:
                         consecutive_failures += 1
-                    
-                    # Small delay between summoners to be respectful
-                    time.sleep(0.05)
-                    
+
                 except RiotAPIError as e:
                     logger.warning(f"API error for summoner {summoner.get('summonerId')}: {e}")
                     consecutive_failures += 1
-                    time.sleep(1)  # Wait a bit longer on API errors
+                    # Back off through the limiter, growing with repeated failures
+                    self.rate_limiter.penalty(min(2.0 ** consecutive_failures, 60.0))
                     continue
                 except Exception as e:
                     logger.error(f"Failed to collect for summoner {summoner.get('summonerId')}: {e}")
                     consecutive_failures += 1
                     continue
-        
-        # Save remaining matches
-        if collected_matches:
-            self.storage.save_matches(collected_matches, rank)
-        
+
+        # Flush remaining matches and surface any background write errors
+        # before reporting the rank as complete
+        if pending_matches:
+            save_futures.append(
+                self._save_pool.submit(self.storage.save_matches, pending_matches, rank)
+            )
+        for future in save_futures:
+            future.result()
+
         # Save PUUID cache
         self.puuid_cache.save()
-        
-        logger.info(f"Collection complete for {rank}: {len(collected_matches)} matches from {summoners_attempted} summoners")
-        return collected_matches
+
+        logger.info(f"Collection complete for {rank}: {total_collected} matches from {summoners_attempted} summoners")
+        return total_collected
     
+    async def _collect_all_ranks_async(self, ranks: List[str],
+                                       matches_per_rank: int) -> Dict[str, Dict]:
+        """
+        Run per-rank collection concurrently, two ranks at a time.
+
+        The shared token bucket keeps the combined request rate inside the
+        Riot budget; the semaphore just bounds memory and log interleaving.
+        Each rank writes its own results key exactly once.
+        """
+        semaphore = asyncio.Semaphore(2)
+        results: Dict[str, Dict] = {}
+
+        async def run_rank(rank: str):
+            async with semaphore:
+                try:
+                    start_time = time.time()
+                    count = await self.collect_for_rank(rank, matches_per_rank)
+                    elapsed = time.time() - start_time
+
+                    results[rank] = {
+                        'count': count,
+                        'time_seconds': elapsed,
+                        'success': True
+                    }
+
+                    logger.info(f"✓ {rank}: {count} matches in {elapsed:.1f}s")
+
+                except Exception as e:
+                    logger.error(f"✗ Failed to collect for rank {rank}: {e}", exc_info=True)
+                    results[rank] = {
+                        'count': 0,
+                        'time_seconds': 0,
+                        'success': False,
+                        'error': str(e)
+                    }
+
+        try:
+            await asyncio.gather(*(run_rank(rank) for rank in ranks))
+        finally:
+            # The async connection pool is bound to this event loop
+            await self.api_client.aclose()
+
+        return results
+
     def collect_all_ranks(self, ranks: List[str] = None, matches_per_rank: int = 100):
         """
         Collect matches for all specified ranks with enhanced error handling.
-        
+
         Args:
             ranks: List of ranks to collect (None = all ranks)
             matches_per_rank: Target matches per rank
         """
         if ranks is None:
             ranks = self.config.get_ranks()
-        
+
         logger.info(f"Starting enhanced collection for ranks: {ranks}")
         logger.info(f"Target: {matches_per_rank} matches per rank")
         logger.info(f"Rate limits: {self.rate_limiter.requests_per_second}/sec, "
                    f"{self.rate_limiter.requests_per_2_minutes}/2min")
-        
-        results = {}
-        for rank in ranks:
-            try:
-                start_time = time.time()
-                matches = self.collect_for_rank(rank, matches_per_rank)
-                elapsed = time.time() - start_time
-                
-                results[rank] = {
-                    'count': len(matches),
-                    'time_seconds': elapsed,
-                    'success': True
-                }
-                
-                logger.info(f"✓ {rank}: {len(matches)} matches in {elapsed:.1f}s")
-                
-                # Small delay between ranks
-                time.sleep(2)
-                
-            except Exception as e:
-                logger.error(f"✗ Failed to collect for rank {rank}: {e}", exc_info=True)
-                results[rank] = {
-                    'count': 0,
-                    'time_seconds': 0,
-                    'success': False,
-                    'error': str(e)
-                }
-                continue
-        
+
+        results = asyncio.run(self._collect_all_ranks_async(ranks, matches_per_rank))
+
         # Save PUUID cache
         self.puuid_cache.save()
         
@@ -240,174 +290,267 @@ class EnhancedMatchCollector:
         stats = self.storage.get_statistics()
         logger.info(f"\nStorage statistics: {stats}")
     
-    def _get_summoners_for_rank(self, rank: str, max_summoners: int = 200) -> List[Dict]:
+    @staticmethod
+    def _parse_entry(entry: Dict) -> Dict:
+        """Normalize a league entry into the summoner dict used downstream"""
+        puuid = entry['puuid']
+        return {
+            'puuid': puuid,
+            'summonerId': entry.get('summonerId') or puuid[:16]
+        }
+
+    async def _resolve_puuid(self, entry: Dict) -> Optional[str]:
+        """Resolve a league entry's PUUID, consulting the cache before the API.
+
+        Entries that carry a PUUID seed the cache (summoner ID -> PUUID
+        is effectively immutable); entries that only carry a summoner ID
+        go through the cache's get_or_fetch, which answers from SQLite
+        first and coalesces concurrent misses for the same summoner into
+        a single API call. The /summoners/ call itself runs on a worker
+        thread so the shared event loop keeps serving the other rank's
+        in-flight requests. Resolved PUUIDs are written back onto the
+        entry dict.
+        """
+        puuid = entry.get('puuid')
+        summoner_id = entry.get('summonerId')
+
+        if puuid:
+            if summoner_id:
+                self.puuid_cache.set(summoner_id, puuid)
+            return puuid
+        if not summoner_id:
+            return None
+
+        async def fetch() -> Optional[str]:
+            try:
+                summoner = await asyncio.to_thread(
+                    self.api_client.get_summoner_by_id, summoner_id
+                )
+            except RiotAPIError as e:
+                logger.debug(f"Failed to resolve summoner {summoner_id}: {e}")
+                return None
+            return summoner.get('puuid') if summoner else None
+
+        puuid = await self.puuid_cache.get_or_fetch(summoner_id, fetch)
+        if puuid:
+            entry['puuid'] = puuid
+        return puuid
+
+    async def _get_summoners_for_rank(self, rank: str, max_summoners: int = 200) -> List[Dict]:
         """
         Get summoners for a specific rank with improved error handling.
-        
+
+        For standard tiers, all division/page combinations are fetched
+        concurrently under the rate budget instead of paging serially, so
+        summoner discovery is one burst rather than ~60 round-trips.
+
         Args:
             rank: Rank tier
             max_summoners: Maximum summoners to retrieve
-            
+
         Returns:
             List of summoner dictionaries with 'puuid' and 'summonerId'
         """
         summoners = []
         
         if rank in ['CHALLENGER', 'GRANDMASTER', 'MASTER']:
-            # Get from apex leagues
+            # Get from apex leagues; the league endpoints are sync-only,
+            # so run them on a worker thread to keep the shared loop free
             try:
                 if rank == 'CHALLENGER':
-                    league = self.api_client.get_challenger_league(self.QUEUE_RANKED_SOLO)
+                    league = await asyncio.to_thread(
+                        self.api_client.get_challenger_league, self.QUEUE_RANKED_SOLO
+                    )
                 elif rank == 'GRANDMASTER':
-                    league = self.api_client.get_grandmaster_league(self.QUEUE_RANKED_SOLO)
+                    league = await asyncio.to_thread(
+                        self.api_client.get_grandmaster_league, self.QUEUE_RANKED_SOLO
+                    )
                 else:  # MASTER
-                    league = self.api_client.get_master_league(self.QUEUE_RANKED_SOLO)
-                
+                    league = await asyncio.to_thread(
+                        self.api_client.get_master_league, self.QUEUE_RANKED_SOLO
+                    )
+
                 if league and 'entries' in league:
-                    entries = league['entries'][:max_summoners]
-                    
-                    total_entries = len(entries)
-                    logger.info(f"Processing {total_entries} league entries for {rank}")
-                    
-                    for idx, entry in enumerate(entries, 1):
+                    # New API returns PUUID directly
+                    for entry in league['entries']:
                         if len(summoners) >= max_summoners:
                             break
-                        
-                        # New API returns PUUID directly!
-                        puuid = entry.get('puuid')
-                        if puuid:
-                            summoners.append({
-                                'puuid': puuid,
-                                'summonerId': entry.get('summonerId', puuid[:16])
-                            })
-                            
-                            if len(summoners) % 50 == 0 or len(summoners) == max_summoners:
-                                logger.info(f"Progress: {len(summoners)}/{max_summoners} summoners "
-                                          f"({idx}/{total_entries} entries processed)")
-                
+                        if await self._resolve_puuid(entry):
+                            summoners.append(self._parse_entry(entry))
+                    logger.info(f"Collected {len(summoners)}/{max_summoners} summoners from {rank}")
+
             except Exception as e:
                 logger.error(f"Failed to get {rank} league: {e}")
         
         else:
-            # Get from standard tiers
-            for division in self.DIVISIONS:
+            # Get from standard tiers: fetch every division/page pair
+            # concurrently, with each request scheduled into its own
+            # rate-limit slot so the burst stays inside the budget
+            max_pages = 15  # Increased from 10 for better coverage
+            pairs = [
+                (division, page)
+                for division in self.DIVISIONS
+                for page in range(1, max_pages + 1)
+            ]
+
+            # Reserve every slot in one limiter pass and let each page
+            # sleep until its own start time. Paying for all 60 requests
+            # up-front with blocking acquire() would stall the shared
+            # event loop for the other rank while the 2-minute bucket
+            # drains.
+            starts = self.rate_limiter.acquire_batch(len(pairs))
+
+            async def fetch_page(division: str, page: int, start: float):
+                delay = start - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                return await self.api_client.get_league_entries_async(
+                    self.QUEUE_RANKED_SOLO, rank, division, page
+                )
+
+            results = await asyncio.gather(
+                *[
+                    fetch_page(division, page, start)
+                    for (division, page), start in zip(pairs, starts)
+                ],
+                return_exceptions=True
+            )
+
+            seen_puuids = set()
+            for (division, page), entries in zip(pairs, results):
+                if isinstance(entries, Exception):
+                    logger.error(f"Failed to get entries for {rank} {division} page {page}: {entries}")
+                    continue
+
+                for entry in entries:
+                    if len(summoners) >= max_summoners:
+                        break
+
+                    puuid = await self._resolve_puuid(entry)
+                    if puuid and puuid not in seen_puuids:
+                        seen_puuids.add(puuid)
+                        summoners.append(self._parse_entry(entry))
+
                 if len(summoners) >= max_summoners:
                     break
-                
-                try:
-                    page = 1
-                    max_pages = 15  # Increased from 10 for better coverage
-                    
-                    while len(summoners) < max_summoners and page <= max_pages:
-                        entries = self.api_client.get_league_entries(
-                            self.QUEUE_RANKED_SOLO, rank, division, page
-                        )
-                        
-                        if not entries:
-                            break
-                        
-                        for entry in entries:
-                            if len(summoners) >= max_summoners:
-                                break
-                            
-                            # New API returns PUUID directly!
-                            puuid = entry.get('puuid')
-                            if puuid:
-                                summoners.append({
-                                    'puuid': puuid,
-                                    'summonerId': entry.get('summonerId', puuid[:16])
-                                })
-                        
-                        if len(summoners) % 50 == 0:
-                            logger.info(f"Progress: {len(summoners)}/{max_summoners} summoners "
-                                      f"(page {page}, {rank} {division})")
-                        
-                        page += 1
-                        
-                        # Small delay between pages
-                        time.sleep(0.1)
-                
-                except Exception as e:
-                    logger.error(f"Failed to get entries for {rank} {division}: {e}")
-                    continue
-        
+
         return summoners
     
-    def _collect_summoner_matches(
-        self, 
-        puuid: str, 
+    async def _fetch_match(self, match_id: str) -> Optional[Dict]:
+        """Fetch one match, mapping API errors to None so gather never aborts"""
+        try:
+            return await self.api_client.get_match_async(match_id)
+        except RiotAPIError as e:
+            logger.debug(f"Failed to get match {match_id}: {e}")
+            return None
+
+    async def _collect_summoner_matches(
+        self,
+        puuid: str,
         rank: str,
-        limit: int = 20, 
+        limit: int = 20,
         queue_id: int = 420
     ) -> List[MatchData]:
         """
         Collect and process matches for a summoner with improved error handling.
-        
+
+        Match details are fetched concurrently over the shared keep-alive
+        client: the pending IDs are split into batches sized to the per-second
+        rate budget, each batch is paid for up-front via the rate limiter and
+        then dispatched with ``asyncio.gather``. Transform and patch filtering
+        happen after each batch completes.
+
         Args:
             puuid: Player UUID
             rank: Rank tier for tagging
             limit: Maximum matches to collect
             queue_id: Queue ID (420 = Ranked Solo/Duo)
-            
+
         Returns:
             List of processed MatchData objects
         """
         processed_matches = []
-        
+
         try:
-            # Get match IDs
-            match_ids = self.api_client.get_match_ids_by_puuid(
-                puuid, 
-                start=0, 
+            # Get match IDs over the shared async client
+            await self.rate_limiter.acquire_async()
+            match_ids = await self.api_client.get_match_ids_by_puuid_async(
+                puuid,
+                start=0,
                 count=min(limit, 100),  # API max is 100
                 queue=queue_id if queue_id else self.config.get_queue_id()
             )
-            
+
             if not match_ids:
                 return []
-            
-            for match_id in match_ids:
-                # Skip if already processed
-                if match_id in self.processed_match_ids:
-                    continue
-                
-                # Limit to requested number
+
+            # Skip matches already processed in this run
+            remaining = [m for m in match_ids if m not in self.processed_match_ids]
+
+            # Serve cache hits from disk before spending any quota; one
+            # IN query resolves the whole candidate batch
+            cache_hits = self.match_cache.get_many(remaining)
+            still_needed = []
+            for match_id in remaining:
                 if len(processed_matches) >= limit:
                     break
-                
-                try:
-                    # Get match data
-                    raw_match = self.api_client.get_match(match_id)
-                    
+
+                cached = cache_hits.get(match_id)
+                if cached is None:
+                    still_needed.append(match_id)
+                    continue
+
+                self.processed_match_ids.add(match_id)
+                if cached.patch in self._accepted_patches:
+                    processed_matches.append(cached)
+            remaining = still_needed
+
+            while remaining and len(processed_matches) < limit:
+                batch_size = max(1, min(len(remaining), self.rate_limiter.tokens_available()))
+                batch, remaining = remaining[:batch_size], remaining[batch_size:]
+
+                # Pay for the whole batch before dispatching it, so the
+                # concurrent fetches stay inside the rate budget
+                for _ in batch:
+                    await self.rate_limiter.acquire_async()
+
+                raw_matches = await asyncio.gather(
+                    *[self._fetch_match(match_id) for match_id in batch]
+                )
+
+                for match_id, raw_match in zip(batch, raw_matches):
                     if not raw_match:
                         continue
-                    
-                    # Save raw if configured
-                    if self.save_raw:
-                        self.storage.save_raw_match(match_id, raw_match)
-                    
-                    # Transform to schema
-                    match_data = self.transformer.transform(raw_match, rank)
-                    
-                    if match_data:
-                        # Filter by current patch (optional, but preferred)
-                        if match_data.patch == self.current_patch or match_data.patch == "unknown":
-                            processed_matches.append(match_data)
-                            self.processed_match_ids.add(match_id)
-                    
-                except RiotAPIError as e:
-                    logger.debug(f"Failed to get match {match_id}: {e}")
-                    continue
-                
-                except Exception as e:
-                    logger.error(f"Error processing match {match_id}: {e}")
-                    continue
-        
+
+                    # Limit to requested number
+                    if len(processed_matches) >= limit:
+                        break
+
+                    try:
+                        # Save raw if configured
+                        if self.save_raw:
+                            self.storage.save_raw_match(match_id, raw_match)
+
+                        # Transform to schema
+                        match_data = self.transformer.transform(raw_match, rank)
+
+                        if match_data:
+                            self.match_cache.put(match_data)
+
+                            # Filter by current patch (optional, but preferred)
+                            if match_data.patch in self._accepted_patches:
+                                processed_matches.append(match_data)
+                                self.processed_match_ids.add(match_id)
+
+                    except Exception as e:
+                        logger.error(f"Error processing match {match_id}: {e}")
+                        continue
+
         except RiotAPIError as e:
             logger.warning(f"API error getting matches for PUUID {puuid[:8]}...: {e}")
         except Exception as e:
             logger.error(f"Failed to get matches for PUUID {puuid[:8]}...: {e}")
-        
+
         return processed_matches
 
 
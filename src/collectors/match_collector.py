@@ -2,9 +2,11 @@
 Main match data collector for League of Legends matches.
 Fetches matches across all ranks with automatic patch tagging and elo filtering.
 """
+import asyncio
 import logging
 import argparse
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Set, Dict, Optional
 from pathlib import Path
 from tqdm import tqdm
@@ -14,6 +16,7 @@ from ..utils.riot_api_client import RiotAPIClient, RiotAPIError
 from ..utils.rate_limiter import RateLimiter
 from ..transformers.match_transformer import MatchTransformer
 from ..storage.data_storage import DataStorage
+from ..storage.match_cache import MatchCache
 from ..transformers.schema import MatchData
 from .puuid_cache import PUUIDCache
 
@@ -59,13 +62,23 @@ class MatchCollector:
             formats=self.config.get_storage_formats()
         )
         self.puuid_cache = PUUIDCache()
-        
+
+        # Incremental saves run here so disk I/O overlaps the next fetch
+        self._flush_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='match-save')
+
         self.save_raw = save_raw
         self.current_patch = self.api_client.get_current_patch()
         
-        # Track processed matches to avoid duplicates
+        # Track matches processed in this run; the persistent match cache
+        # below carries dedup state across restarts without holding every
+        # historical match ID in memory
         self.processed_match_ids: Set[str] = set()
-        
+
+        self.match_cache = MatchCache(
+            str(Path(self.config.get_storage_path()) / 'match_cache.sqlite')
+        )
+
+
         cache_stats = self.puuid_cache.stats()
         logger.info(f"Match collector initialized for patch {self.current_patch}")
         logger.info(f"PUUID cache loaded: {cache_stats['total_entries']} entries")
@@ -73,85 +86,118 @@ class MatchCollector:
     def collect_for_rank(self, rank: str, target_matches: int = 100) -> int:
         """
         Collect matches for a specific rank.
-        
+
         Args:
             rank: Rank tier (IRON, BRONZE, ..., CHALLENGER)
             target_matches: Target number of matches to collect
-            
+
         Returns:
             Number of matches collected (matches are saved to disk incrementally)
         """
+        return asyncio.run(self._collect_for_rank_async(rank, target_matches))
+
+    async def _collect_for_rank_async(self, rank: str, target_matches: int) -> int:
+        """
+        Async driver behind :meth:`collect_for_rank`.
+
+        Match detail fetches fan out with ``asyncio.gather`` in batches
+        sized to the rate-limit budget, so wall time tracks the Riot quota
+        rather than serial round-trips.
+        """
         rank = rank.upper()
         logger.info(f"Starting collection for {rank} (target: {target_matches} matches)")
-        
+
         # Get summoners for this rank
-        summoners = self._get_summoners_for_rank(rank)
+        summoners = await self._get_summoners_for_rank(rank)
         logger.info(f"Found {len(summoners)} summoners in {rank}")
-        
+
         if not summoners:
             logger.warning(f"No summoners found for {rank}")
             return 0
-        
+
         # Collect matches
         collected_matches = []
         total_collected = 0  # Track total matches collected
-        
+        pending_flush = None  # At most one in-flight save (backpressure)
+
         with tqdm(total=target_matches, desc=f"Collecting {rank}") as pbar:
             for summoner in summoners:
                 if total_collected >= target_matches:
                     break
-                
+
                 try:
-                    matches = self._collect_summoner_matches(
-                        summoner['puuid'], 
+                    matches = await self._collect_summoner_matches(
+                        summoner['puuid'],
                         rank,
                         limit=min(20, target_matches - total_collected)
                     )
-                    
+
                     collected_matches.extend(matches)
                     total_collected += len(matches)
                     pbar.update(len(matches))
-                    
-                    # Save incrementally
+
+                    # Save incrementally on a worker thread so the next
+                    # fetch isn't stalled by write latency
                     if len(collected_matches) >= 50:
-                        self.storage.save_matches(collected_matches, rank)
+                        if pending_flush is not None:
+                            pending_flush.result()
+                        pending_flush = self._flush_pool.submit(
+                            self.storage.save_matches, collected_matches, rank
+                        )
                         collected_matches = []
-                    
+
                 except Exception as e:
                     logger.error(f"Failed to collect for summoner {summoner.get('summonerId')}: {e}")
                     continue
-        
-        # Save remaining matches
+
+        # Save remaining matches and join the in-flight flush
+        if pending_flush is not None:
+            pending_flush.result()
         if collected_matches:
             self.storage.save_matches(collected_matches, rank)
-        
+
         # Save PUUID cache
         self.puuid_cache.save()
-        
+
+        # Release the async connection pool; it is bound to this event loop
+        await self.api_client.aclose()
+
         logger.info(f"Collection complete for {rank}: {total_collected} matches collected")
         return total_collected
     
     def collect_all_ranks(self, ranks: List[str] = None, matches_per_rank: int = 100):
         """
         Collect matches for all specified ranks.
-        
+
+        Ranks run concurrently on a thread pool — each is an independent,
+        I/O-bound stream of API calls, and the shared rate limiter (not
+        serialization) becomes the throughput bound. Ranks never write
+        the same storage file, so the per-rank saves don't collide.
+
         Args:
             ranks: List of ranks to collect (None = all ranks)
             matches_per_rank: Target matches per rank
         """
         if ranks is None:
             ranks = self.config.get_ranks()
-        
+
         logger.info(f"Collecting matches for ranks: {ranks}")
         logger.info(f"Target: {matches_per_rank} matches per rank")
-        
-        for rank in ranks:
-            try:
-                self.collect_for_rank(rank, matches_per_rank)
-            except Exception as e:
-                logger.error(f"Failed to collect for rank {rank}: {e}", exc_info=True)
-                continue
-        
+
+        with ThreadPoolExecutor(
+            max_workers=min(4, len(ranks)), thread_name_prefix='rank-collect'
+        ) as executor:
+            futures = {
+                executor.submit(self.collect_for_rank, rank, matches_per_rank): rank
+                for rank in ranks
+            }
+            for future in as_completed(futures):
+                rank = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Failed to collect for rank {rank}: {e}", exc_info=True)
+
         # Save PUUID cache
         self.puuid_cache.save()
         
@@ -160,14 +206,51 @@ class MatchCollector:
         logger.info(f"Collection complete. Total matches: {stats['total_matches']}")
         logger.info(f"Matches by rank: {stats['by_rank']}")
     
-    def _get_summoners_for_rank(self, rank: str, max_summoners: int = 100) -> List[Dict]:
+    def _resolve_puuid(self, entry: Dict) -> Optional[str]:
+        """Resolve a league entry's PUUID, consulting the cache before the API.
+
+        Entries that carry a PUUID seed the cache (summoner ID -> PUUID
+        is effectively immutable); entries that only carry a summoner ID
+        are answered from the cache first, so repeat runs issue no
+        /summoners/ lookups. Resolved PUUIDs are written back onto the
+        entry dict.
+        """
+        puuid = entry.get('puuid')
+        summoner_id = entry.get('summonerId')
+
+        if puuid:
+            if summoner_id:
+                self.puuid_cache.set(summoner_id, puuid)
+            return puuid
+        if not summoner_id:
+            return None
+
+        puuid = self.puuid_cache.get(summoner_id)
+        if puuid is None:
+            try:
+                summoner = self.api_client.get_summoner_by_id(summoner_id)
+            except RiotAPIError as e:
+                logger.debug(f"Failed to resolve summoner {summoner_id}: {e}")
+                return None
+            puuid = summoner.get('puuid') if summoner else None
+            if puuid:
+                self.puuid_cache.set(summoner_id, puuid)
+
+        if puuid:
+            entry['puuid'] = puuid
+        return puuid
+
+    async def _get_summoners_for_rank(self, rank: str, max_summoners: int = 100) -> List[Dict]:
         """
         Get summoners for a specific rank.
-        
+
+        Standard-tier division pages are fetched concurrently under the
+        rate budget instead of one page at a time.
+
         Args:
             rank: Rank tier
             max_summoners: Maximum summoners to retrieve
-            
+
         Returns:
             List of summoner dictionaries with 'puuid' and 'summonerId'
         """
@@ -192,9 +275,8 @@ class MatchCollector:
                     for idx, entry in enumerate(entries, 1):
                         if len(summoners) >= max_summoners:
                             break
-                        
-                        # New API returns PUUID directly!
-                        puuid = entry.get('puuid')
+
+                        puuid = self._resolve_puuid(entry)
                         if puuid:
                             summoners.append({
                                 'puuid': puuid,
@@ -208,109 +290,144 @@ class MatchCollector:
                 logger.error(f"Failed to get {rank} league: {e}")
         
         else:
-            # Get from standard tiers
-            for division in self.DIVISIONS:
+            # Get from standard tiers: every division/page pair is fetched
+            # concurrently, each request paid for up-front so the burst
+            # stays inside the rate budget
+            max_pages = 10  # Each page has ~200 entries
+            pairs = [
+                (division, page)
+                for division in self.DIVISIONS
+                for page in range(1, max_pages + 1)
+            ]
+
+            for _ in pairs:
+                await self.rate_limiter.acquire_async()
+
+            results = await asyncio.gather(
+                *[
+                    self.api_client.get_league_entries_async(
+                        self.QUEUE_RANKED_SOLO, rank, division, page
+                    )
+                    for division, page in pairs
+                ],
+                return_exceptions=True
+            )
+
+            seen_puuids = set()
+            for (division, page), entries in zip(pairs, results):
+                if isinstance(entries, Exception):
+                    logger.error(f"Failed to get entries for {rank} {division} page {page}: {entries}")
+                    continue
+
+                for entry in entries:
+                    if len(summoners) >= max_summoners:
+                        break
+
+                    puuid = self._resolve_puuid(entry)
+                    if puuid and puuid not in seen_puuids:
+                        seen_puuids.add(puuid)
+                        summoners.append({
+                            'puuid': puuid,
+                            'summonerId': entry.get('summonerId', puuid[:16])  # For backward compat
+                        })
+
                 if len(summoners) >= max_summoners:
                     break
-                
-                try:
-                    page = 1
-                    while len(summoners) < max_summoners:
-                        entries = self.api_client.get_league_entries(
-                            self.QUEUE_RANKED_SOLO, rank, division, page
-                        )
-                        
-                        if not entries:
-                            break
-                        
-                        for entry in entries:
-                            if len(summoners) >= max_summoners:
-                                break
-                            
-                            # New API returns PUUID directly!
-                            puuid = entry.get('puuid')
-                            if puuid:
-                                summoners.append({
-                                    'puuid': puuid,
-                                    'summonerId': entry.get('summonerId', puuid[:16])  # For backward compat
-                                })
-                        
-                        if len(summoners) % 50 == 0 or len(summoners) >= max_summoners:
-                            logger.info(f"Progress: {len(summoners)}/{max_summoners} summoners (page {page}, {rank} {division})")
-                        
-                        page += 1
-                        
-                        # Limit pages to avoid excessive requests (each page has ~200 entries)
-                        if page > 10:
-                            logger.info(f"Reached page limit for {rank} {division}")
-                            break
-                
-                except Exception as e:
-                    logger.error(f"Failed to get entries for {rank} {division}: {e}")
-                    continue
-        
+
         return summoners
     
-    def _collect_summoner_matches(self, puuid: str, rank: str, 
-                                  limit: int = 20, queue_id: int = 420) -> List[MatchData]:
+    async def _fetch_match(self, match_id: str) -> Optional[Dict]:
+        """Fetch one match, mapping API errors to None so gather never aborts"""
+        try:
+            return await self.api_client.get_match_async(match_id)
+        except RiotAPIError as e:
+            logger.debug(f"Failed to get match {match_id}: {e}")
+            return None
+
+    async def _collect_summoner_matches(self, puuid: str, rank: str,
+                                        limit: int = 20, queue_id: int = 420) -> List[MatchData]:
         """
         Collect and process matches for a summoner.
-        
+
+        Match details are fetched concurrently over the shared keep-alive
+        client in batches sized to the current rate budget, each batch
+        paid for through the rate limiter before dispatch.
+
         Args:
             puuid: Player UUID
             rank: Rank tier for tagging
             limit: Maximum matches to collect
-            
+
         Returns:
             List of processed MatchData objects
         """
         processed_matches = []
-        
+
         try:
             # Get match IDs
-            match_ids = self.api_client.get_match_ids_by_puuid(
-                puuid, 
-                start=0, 
+            await self.rate_limiter.acquire_async()
+            match_ids = await self.api_client.get_match_ids_by_puuid_async(
+                puuid,
+                start=0,
                 count=limit,
                 queue=self.config.get_queue_id()
             )
-            
-            for match_id in match_ids:
-                # Skip if already processed
-                if match_id in self.processed_match_ids:
-                    continue
-                
-                try:
-                    # Get match data
-                    raw_match = self.api_client.get_match(match_id)
-                    
+
+            # Skip matches already processed this run
+            remaining = [m for m in match_ids if m not in self.processed_match_ids]
+
+            # Serve matches seen in previous runs from the persistent cache
+            cache_hits = self.match_cache.get_many(remaining)
+            if cache_hits:
+                remaining = [m for m in remaining if m not in cache_hits]
+                for match_id, cached in cache_hits.items():
+                    self.processed_match_ids.add(match_id)
+                    if len(processed_matches) >= limit:
+                        continue
+                    if cached.patch == self.current_patch or cached.patch == "unknown":
+                        processed_matches.append(cached)
+
+            while remaining and len(processed_matches) < limit:
+                batch_size = max(1, min(len(remaining), self.rate_limiter.tokens_available()))
+                batch, remaining = remaining[:batch_size], remaining[batch_size:]
+
+                for _ in batch:
+                    await self.rate_limiter.acquire_async()
+
+                raw_matches = await asyncio.gather(
+                    *[self._fetch_match(match_id) for match_id in batch]
+                )
+
+                for match_id, raw_match in zip(batch, raw_matches):
                     if not raw_match:
                         continue
-                    
-                    # Save raw if configured
-                    if self.save_raw:
-                        self.storage.save_raw_match(match_id, raw_match)
-                    
-                    # Transform to schema
-                    match_data = self.transformer.transform(raw_match, rank)
-                    
-                    if match_data:
-                        # Filter by current patch (optional)
-                        if match_data.patch == self.current_patch or match_data.patch == "unknown":
-                            processed_matches.append(match_data)
-                            self.processed_match_ids.add(match_id)
-                    
-                except RiotAPIError as e:
-                    logger.debug(f"Failed to get match {match_id}: {e}")
-                    continue
-                
-                except Exception as e:
-                    logger.error(f"Error processing match {match_id}: {e}")
-                    continue
-        
+
+                    if len(processed_matches) >= limit:
+                        break
+
+                    try:
+                        # Save raw if configured
+                        if self.save_raw:
+                            self.storage.save_raw_match(match_id, raw_match)
+
+                        # Transform to schema
+                        match_data = self.transformer.transform(raw_match, rank)
+
+                        if match_data:
+                            self.match_cache.put(match_data)
+
+                            # Filter by current patch (optional)
+                            if match_data.patch == self.current_patch or match_data.patch == "unknown":
+                                processed_matches.append(match_data)
+                                self.processed_match_ids.add(match_id)
+
+                    except Exception as e:
+                        logger.error(f"Error processing match {match_id}: {e}")
+                        continue
+
         except Exception as e:
             logger.error(f"Failed to get matches for PUUID {puuid}: {e}")
-        
+
         return processed_matches
 
 
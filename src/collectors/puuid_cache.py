@@ -2,106 +2,187 @@
 PUUID Cache for efficient summoner lookups.
 Caches summoner ID -> PUUID mappings to avoid redundant API calls.
 """
+import asyncio
 import json
 import logging
+import sqlite3
+import threading
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Awaitable, Callable, Optional, Dict
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
 
 class PUUIDCache:
-    """Cache for summoner ID to PUUID mappings."""
-    
-    def __init__(self, cache_file: str = "data/puuid_cache.json", 
+    """Cache for summoner ID to PUUID mappings.
+
+    Backed by SQLite in WAL mode, so every set() is durable on its own and
+    save() costs O(delta since last checkpoint) instead of rewriting the
+    whole mapping to a JSON file.
+    """
+
+    def __init__(self, cache_file: str = "data/puuid_cache.sqlite",
                  ttl_days: int = 7):
         """
         Initialize PUUID cache.
-        
+
         Args:
-            cache_file: Path to cache file
+            cache_file: Path to the SQLite cache file
             ttl_days: Time-to-live for cache entries in days
         """
         self.cache_file = Path(cache_file)
         self.ttl_days = ttl_days
-        self.cache: Dict[str, Dict] = {}
-        self._load_cache()
-    
-    def _load_cache(self):
-        """Load cache from disk."""
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'r') as f:
-                    self.cache = json.load(f)
-                logger.info(f"Loaded {len(self.cache)} entries from PUUID cache")
-            except Exception as e:
-                logger.error(f"Failed to load cache: {e}")
-                self.cache = {}
-        else:
-            logger.info("No existing cache found, starting fresh")
-            self.cache = {}
-    
-    def _save_cache(self):
-        """Save cache to disk."""
+        # In-flight lookups, so concurrent tasks share one fetch per key
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Shared across per-rank collection threads; the lock serializes
+        # statement execution on the single connection
+        self._conn = sqlite3.connect(
+            str(self.cache_file), isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS puuid "
+            "(summoner_id TEXT PRIMARY KEY, puuid TEXT, timestamp TEXT)"
+        )
+
+        self._migrate_legacy_json()
+        logger.info(f"PUUID cache ready with {self._count()} entries")
+
+    def _count(self) -> int:
+        """Number of cached entries"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM puuid").fetchone()[0]
+
+    def _migrate_legacy_json(self):
+        """Import entries from the pre-SQLite JSON cache, if one exists"""
+        legacy_file = self.cache_file.with_suffix('.json')
+        if not legacy_file.exists() or self._count() > 0:
+            return
+
         try:
-            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache, f, indent=2)
-            logger.debug(f"Saved {len(self.cache)} entries to cache")
+            raw = legacy_file.read_bytes()
+            legacy = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+            # One transaction for the whole import; in autocommit mode
+            # every row would otherwise sync individually
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO puuid (summoner_id, puuid, timestamp) VALUES (?, ?, ?)",
+                    [
+                        (summoner_id, entry['puuid'], entry['timestamp'])
+                        for summoner_id, entry in legacy.items()
+                    ]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            logger.info(f"Migrated {len(legacy)} entries from legacy JSON cache")
         except Exception as e:
-            logger.error(f"Failed to save cache: {e}")
-    
+            logger.error(f"Failed to migrate legacy cache: {e}")
+
     def get(self, summoner_id: str) -> Optional[str]:
         """
         Get PUUID for a summoner ID.
-        
+
         Args:
             summoner_id: Summoner ID
-            
+
         Returns:
             PUUID if found and not expired, None otherwise
         """
-        if summoner_id not in self.cache:
-            return None
-        
-        entry = self.cache[summoner_id]
-        
-        # Check if entry is expired
-        cached_time = datetime.fromisoformat(entry['timestamp'])
-        if datetime.now() - cached_time > timedelta(days=self.ttl_days):
-            logger.debug(f"Cache entry for {summoner_id} expired")
-            del self.cache[summoner_id]
-            return None
-        
-        return entry['puuid']
-    
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT puuid, timestamp FROM puuid WHERE summoner_id=?",
+                (summoner_id,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            # ISO-8601 timestamps order lexicographically, so the expiry
+            # check is a string compare — no datetime parsing per lookup
+            cutoff = (datetime.now() - timedelta(days=self.ttl_days)).isoformat()
+            if row[1] < cutoff:
+                logger.debug(f"Cache entry for {summoner_id} expired")
+                self._conn.execute("DELETE FROM puuid WHERE summoner_id=?", (summoner_id,))
+                return None
+
+            return row[0]
+
     def set(self, summoner_id: str, puuid: str):
         """
         Cache a summoner ID -> PUUID mapping.
-        
+
+        The upsert is durable immediately under WAL, so no periodic bulk
+        save is needed.
+
         Args:
             summoner_id: Summoner ID
             puuid: PUUID
         """
-        self.cache[summoner_id] = {
-            'puuid': puuid,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        # Save every 50 entries to avoid losing too much progress
-        if len(self.cache) % 50 == 0:
-            self._save_cache()
-    
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO puuid (summoner_id, puuid, timestamp) VALUES (?, ?, ?)",
+                (summoner_id, puuid, datetime.now().isoformat())
+            )
+
+    async def get_or_fetch(self, summoner_id: str,
+                           fetch: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+        """
+        Get a PUUID, coalescing concurrent fetches for the same summoner.
+
+        Cache hits return immediately. On a miss, the first caller starts
+        the fetch and later callers await the same in-flight future, so a
+        burst of concurrent tasks costs exactly one API call per summoner.
+
+        Args:
+            summoner_id: Summoner ID
+            fetch: Coroutine factory performing the API lookup
+
+        Returns:
+            PUUID, or None if the fetch yielded nothing
+        """
+        puuid = self.get(summoner_id)
+        if puuid is not None:
+            return puuid
+
+        inflight = self._inflight.get(summoner_id)
+        if inflight is not None:
+            return await inflight
+
+        future = asyncio.ensure_future(fetch())
+        self._inflight[summoner_id] = future
+        try:
+            puuid = await future
+            if puuid:
+                self.set(summoner_id, puuid)
+            return puuid
+        finally:
+            self._inflight.pop(summoner_id, None)
+
     def save(self):
-        """Explicitly save cache to disk."""
-        self._save_cache()
-    
+        """Checkpoint the WAL; entries are already durable when written."""
+        try:
+            with self._lock:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except Exception as e:
+            logger.error(f"Failed to checkpoint cache: {e}")
+
     def stats(self) -> Dict[str, int]:
         """Get cache statistics."""
         return {
-            'total_entries': len(self.cache),
+            'total_entries': self._count(),
             'file_exists': self.cache_file.exists()
         }
-
-
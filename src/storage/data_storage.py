@@ -1,17 +1,71 @@
 """
 Storage handlers for match data in multiple formats.
 """
+import gzip
 import json
 import logging
+import threading
 from pathlib import Path
-from typing import List, Dict
-import pandas as pd
+from typing import List, Dict, Optional, Set
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
-from ..transformers.schema import MatchData
+from ..transformers.schema import ChampionStats, DerivedFeatures, MatchData, Objectives
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 logger = logging.getLogger(__name__)
 
+# Raw-match stream rolls to a new file after this many records
+RAW_ROLL_RECORDS = 10_000
+
+# Buffer incoming batches until a row group of at least this many rows
+# can be written; 50-row row groups make terrible Parquet
+PARQUET_ROW_GROUP_ROWS = 5000
+
+# Arrow struct mirroring schema.ChampionStats
+CHAMPION_STATS_STRUCT = pa.struct([
+    ('id', pa.int64()),
+    ('role', pa.string()),
+    ('kda', pa.float64()),
+    ('cs', pa.float64()),
+    ('dmg_share', pa.float64()),
+    ('gold_share', pa.float64()),
+])
+
+# Fixed schema for the flattened match rows (see _matches_to_table), so
+# incremental flushes can append row groups through a ParquetWriter
+# instead of re-reading and rewriting the whole file. Picks, bans and
+# champion stats are native list/struct columns — no JSON round-trip
+# on load, and dictionary encoding works on the nested values.
+PARQUET_SCHEMA = pa.schema([
+    ('match_id', pa.string()),
+    ('patch', pa.string()),
+    ('elo_rank', pa.string()),
+    ('blue_win', pa.bool_()),
+    ('blue_picks', pa.list_(pa.int64())),
+    ('red_picks', pa.list_(pa.int64())),
+    ('blue_bans', pa.list_(pa.int64())),
+    ('red_bans', pa.list_(pa.int64())),
+    ('blue_dragons', pa.int64()),
+    ('blue_heralds', pa.int64()),
+    ('blue_barons', pa.int64()),
+    ('blue_towers', pa.int64()),
+    ('red_dragons', pa.int64()),
+    ('red_heralds', pa.int64()),
+    ('red_barons', pa.int64()),
+    ('red_towers', pa.int64()),
+    ('ap_ad_ratio', pa.float64()),
+    ('engage_score', pa.float64()),
+    ('splitpush_score', pa.float64()),
+    ('teamfight_synergy', pa.float64()),
+    ('champion_stats', pa.list_(CHAMPION_STATS_STRUCT)),
+])
+
 
 class DataStorage:
     """Handles saving and loading match data in various formats"""
@@ -33,24 +87,139 @@ class DataStorage:
         
         self.raw_path.mkdir(parents=True, exist_ok=True)
         self.processed_path.mkdir(parents=True, exist_ok=True)
-        
+
+        # Open Parquet writers, keyed by (rank, patch) shard; each flush
+        # appends a row group instead of rewriting the file, and a patch
+        # rotation simply starts a new immutable shard
+        self._writers: Dict[tuple, pq.ParquetWriter] = {}
+        # Guards writer creation/close; per-rank collection threads
+        # share this storage instance
+        self._writers_lock = threading.RLock()
+
+        # get_statistics memo: path -> (mtime, row count, patch counts)
+        self._stats_cache: Dict[Path, tuple] = {}
+
+        # Match IDs already written per rank; appends no longer dedup
+        # against the file, so duplicates are dropped at the gate
+        self._seen_ids: Dict[str, Set[str]] = {}
+        # Ranks whose pre-shard matches_<rank>.parquet was already
+        # scanned into the dedup gate
+        self._legacy_seeded: Set[str] = set()
+
+        # Serializes NDJSON appends and the one-time legacy migration;
+        # the save pool may flush two batches concurrently and buffered
+        # appends must not interleave mid-line
+        self._json_lock = threading.Lock()
+
+        # Raw matches stream into a rolling gzip NDJSON file rather
+        # than one inode + open/close per match
+        self._raw_writer = None
+        self._raw_file = None
+        self._raw_count = 0
+        self._raw_lock = threading.Lock()
+
+        # Tables waiting to be combined into a full-size row group,
+        # keyed by (rank, patch) shard
+        self._pending_tables: Dict[tuple, List[pa.Table]] = {}
+        self._pending_rows: Dict[tuple, int] = {}
+
         logger.info(f"Data storage initialized at {self.base_path}")
-    
+
+    def close(self):
+        """Close open writers, finalizing file footers and streams"""
+        with self._raw_lock:
+            self._close_raw_writer()
+        with self._writers_lock:
+            for shard in list(self._pending_tables):
+                try:
+                    self._flush_pending(shard)
+                except Exception as e:
+                    logger.error(f"Failed to flush pending Parquet rows for {shard}: {e}")
+            for shard, writer in self._writers.items():
+                try:
+                    writer.close()
+                except Exception as e:
+                    logger.error(f"Failed to close Parquet writer for {shard}: {e}")
+            self._writers.clear()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _dump_json_bytes(data) -> bytes:
+        """Serialize to indented JSON bytes, via orjson when available"""
+        if HAS_ORJSON:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        return json.dumps(data, indent=2).encode('utf-8')
+
+    @staticmethod
+    def _load_json_bytes(raw: bytes):
+        """Deserialize JSON bytes, via orjson when available"""
+        return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+    @staticmethod
+    def _dump_json_str(data) -> str:
+        """Serialize to a compact JSON string, via orjson when available"""
+        if HAS_ORJSON:
+            return orjson.dumps(data).decode('utf-8')
+        return json.dumps(data, separators=(',', ':'))
+
+    @staticmethod
+    def _dump_json_line(data) -> bytes:
+        """Serialize one NDJSON line (compact, newline-terminated)"""
+        if HAS_ORJSON:
+            return orjson.dumps(data) + b"\n"
+        return json.dumps(data, separators=(',', ':')).encode('utf-8') + b"\n"
+
     def save_raw_match(self, match_id: str, raw_data: Dict):
         """
         Save raw API response for debugging.
-        
+
+        Responses append as compact NDJSON lines to a rolling gzip
+        stream under raw/ — one buffered write instead of a file per
+        match, and an order of magnitude less disk.
+
         Args:
             match_id: Match identifier
             raw_data: Raw match data from API
         """
         try:
-            file_path = self.raw_path / f"{match_id}.json"
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(raw_data, f, indent=2)
+            line = self._dump_json_line({'id': match_id, 'data': raw_data})
+            with self._raw_lock:
+                self._get_raw_writer().write(line)
+                self._raw_count += 1
+                if self._raw_count >= RAW_ROLL_RECORDS:
+                    self._close_raw_writer()
             logger.debug(f"Saved raw match: {match_id}")
         except Exception as e:
             logger.error(f"Failed to save raw match {match_id}: {e}")
+
+    def _get_raw_writer(self):
+        """Lazily open the next raw-match stream file"""
+        if self._raw_writer is None:
+            index = 0
+            while (self.raw_path / f"raw_matches_{index:04d}.jsonl.gz").exists():
+                index += 1
+            path = self.raw_path / f"raw_matches_{index:04d}.jsonl.gz"
+            # 1 MB user-space buffer under the compressor, so syscalls
+            # happen per megabyte rather than per compressed chunk
+            self._raw_file = open(path, 'ab', buffering=1 << 20)
+            self._raw_writer = gzip.GzipFile(fileobj=self._raw_file, mode='ab')
+            self._raw_count = 0
+            logger.info(f"Raw match stream opened: {path.name}")
+        return self._raw_writer
+
+    def _close_raw_writer(self):
+        """Close the current raw-match stream, if open"""
+        if self._raw_writer is not None:
+            self._raw_writer.close()
+            self._raw_writer = None
+        if self._raw_file is not None:
+            self._raw_file.close()
+            self._raw_file = None
     
     def save_matches(self, matches: List[MatchData], rank: str = "all"):
         """
@@ -63,7 +232,18 @@ class DataStorage:
         if not matches:
             logger.warning("No matches to save")
             return
-        
+
+        # Drop anything already written for this rank; two collectors
+        # ingesting overlapping summoner streams converge here
+        with self._writers_lock:
+            seen = self._seen_ids.setdefault(rank, set())
+            matches = [m for m in matches if m.match_id not in seen]
+            seen.update(m.match_id for m in matches)
+
+        if not matches:
+            logger.debug(f"All matches in this batch were already saved ({rank})")
+            return
+
         # Convert to dictionaries
         match_dicts = [match.model_dump() for match in matches]
         
@@ -75,101 +255,203 @@ class DataStorage:
             self._save_parquet(match_dicts, rank)
     
     def _save_json(self, matches: List[Dict], rank: str):
-        """Save matches as JSON"""
+        """Save matches as NDJSON (one object per line, append-only).
+
+        Appending lines keeps each incremental flush O(new matches);
+        the old single-array format re-read and re-wrote the whole file
+        on every save. Dedup is the collectors' job (they track
+        processed match IDs), so no existing IDs need re-parsing here.
+        """
         try:
-            file_path = self.processed_path / f"matches_{rank}.json"
-            
-            # Load existing if present
-            existing = []
-            if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    existing = json.load(f)
-            
-            # Merge (avoid duplicates by match_id)
-            existing_ids = {m['match_id'] for m in existing}
-            new_matches = [m for m in matches if m['match_id'] not in existing_ids]
-            
-            all_matches = existing + new_matches
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(all_matches, f, indent=2)
-            
-            logger.info(f"Saved {len(new_matches)} matches to JSON ({rank})")
-            
+            file_path = self.processed_path / f"matches_{rank}.ndjson"
+            with self._json_lock:
+                self._migrate_legacy_json(rank, file_path)
+
+                with open(file_path, 'ab', buffering=1 << 20) as f:
+                    for match in matches:
+                        f.write(self._dump_json_line(match))
+
+            logger.info(f"Saved {len(matches)} matches to NDJSON ({rank})")
+
+        except Exception as e:
+            logger.error(f"Failed to save NDJSON: {e}")
+
+    def _migrate_legacy_json(self, rank: str, ndjson_path: Path):
+        """Convert a pre-NDJSON matches_<rank>.json array once (lock held)"""
+        legacy_path = self.processed_path / f"matches_{rank}.json"
+        if ndjson_path.exists() or not legacy_path.exists():
+            return
+
+        try:
+            legacy = self._load_json_bytes(legacy_path.read_bytes())
+            with open(ndjson_path, 'ab', buffering=1 << 20) as f:
+                for match in legacy:
+                    f.write(self._dump_json_line(match))
+            logger.info(f"Migrated {len(legacy)} matches from legacy JSON ({rank})")
         except Exception as e:
-            logger.error(f"Failed to save JSON: {e}")
+            logger.error(f"Failed to migrate legacy JSON for {rank}: {e}")
     
     def _save_parquet(self, matches: List[Dict], rank: str):
-        """Save matches as Parquet"""
+        """Save matches as Parquet.
+
+        Incoming batches accumulate in memory until they amount to a
+        full-size row group, then append through a per-(rank, patch)
+        shard writer with a fixed schema; the old path re-read the
+        whole file, concatenated DataFrames, and rewrote it per flush.
+        Sharding by patch means a patch rotation just starts a fresh
+        file and historical shards stay immutable. Dedup happens in
+        the collectors, not here. Footers are finalized by
+        :meth:`close` (readers flush writers themselves).
+        """
         try:
-            file_path = self.processed_path / f"matches_{rank}.parquet"
-            
-            # Flatten nested structures for Parquet
-            flattened = self._flatten_matches(matches)
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(flattened)
-            
-            # Load existing if present
-            if file_path.exists():
-                existing_df = pd.read_parquet(file_path)
-                
-                # Merge and remove duplicates
-                df = pd.concat([existing_df, df], ignore_index=True)
-                df = df.drop_duplicates(subset=['match_id'], keep='last')
-            
-            # Save with compression
-            df.to_parquet(file_path, compression='snappy', index=False)
-            
+            # Batches are usually single-patch; group just in case
+            groups: Dict[str, List[Dict]] = {}
+            for match in matches:
+                groups.setdefault(match['patch'], []).append(match)
+
+            tables = {
+                (rank, patch): self._matches_to_table(group)
+                for patch, group in groups.items()
+            }
+
+            with self._writers_lock:
+                for shard, table in tables.items():
+                    self._pending_tables.setdefault(shard, []).append(table)
+                    self._pending_rows[shard] = self._pending_rows.get(shard, 0) + table.num_rows
+                    if self._pending_rows[shard] >= PARQUET_ROW_GROUP_ROWS:
+                        self._flush_pending(shard)
+
             logger.info(f"Saved {len(matches)} matches to Parquet ({rank})")
-            
+
         except Exception as e:
             logger.error(f"Failed to save Parquet: {e}")
+
+    def _flush_pending(self, shard: tuple):
+        """Write a shard's buffered tables as one row group (lock held)"""
+        tables = self._pending_tables.pop(shard, [])
+        self._pending_rows.pop(shard, None)
+        if not tables:
+            return
+
+        combined = tables[0] if len(tables) == 1 else pa.concat_tables(tables)
+        self._get_parquet_writer(shard).write_table(combined)
+
+    def _get_parquet_writer(self, shard: tuple) -> pq.ParquetWriter:
+        """Lazily open the append writer for a (rank, patch) shard.
+
+        Opening a ParquetWriter truncates the target, so any existing
+        shard file is read once and rewritten through the new writer
+        first — a one-time cost per process, not per flush. The first
+        writer for a rank also seeds the dedup gate from the pre-shard
+        matches_<rank>.parquet, reading only its match_id column.
+        """
+        with self._writers_lock:
+            writer = self._writers.get(shard)
+            if writer is not None:
+                return writer
+
+            rank, patch = shard
+            if rank not in self._legacy_seeded:
+                self._legacy_seeded.add(rank)
+                legacy_path = self.processed_path / f"matches_{rank}.parquet"
+                if legacy_path.exists():
+                    self._seen_ids.setdefault(rank, set()).update(
+                        pq.read_table(legacy_path, columns=['match_id'])['match_id'].to_pylist()
+                    )
+
+            file_path = self.processed_path / f"matches_{rank}_{patch}.parquet"
+            existing = None
+            if file_path.exists():
+                existing = pq.read_table(file_path)
+                if existing.schema != PARQUET_SCHEMA:
+                    existing = self._upgrade_legacy_table(existing)
+                # Seed the dedup gate so appends can't repeat rows that
+                # are already on disk
+                self._seen_ids.setdefault(rank, set()).update(
+                    existing['match_id'].to_pylist()
+                )
+
+            # zstd level 3 roughly halves snappy's footprint at similar
+            # decode speed; dictionary encoding collapses the repetitive
+            # pick/ban and champion-stat values further
+            writer = pq.ParquetWriter(
+                str(file_path), PARQUET_SCHEMA,
+                compression='zstd', compression_level=3, use_dictionary=True
+            )
+            if existing is not None:
+                writer.write_table(existing)
+
+            self._writers[shard] = writer
+            return writer
     
-    def _flatten_matches(self, matches: List[Dict]) -> List[Dict]:
+    @staticmethod
+    def _upgrade_legacy_table(table: pa.Table) -> pa.Table:
+        """Convert a table from an older file layout to PARQUET_SCHEMA.
+
+        Older files stored picks/bans and champion stats as JSON-string
+        columns; those are decoded into the native list/struct types.
+        Everything else is cast.
         """
-        Flatten nested structures for Parquet storage.
-        Converts lists and nested objects to string representations or separate columns.
+        loads = orjson.loads if HAS_ORJSON else json.loads
+        arrays = []
+        for field in PARQUET_SCHEMA:
+            column = table[field.name]
+            if pa.types.is_string(column.type) and not pa.types.is_string(field.type):
+                values = [loads(v) for v in column.to_pylist()]
+                arrays.append(pa.array(values, type=field.type))
+            else:
+                arrays.append(column.cast(field.type))
+        return pa.Table.from_arrays(arrays, schema=PARQUET_SCHEMA)
+
+    def _matches_to_table(self, matches: List[Dict]) -> pa.Table:
         """
-        flattened = []
-        
+        Flatten nested match structures straight into arrow columns.
+
+        Builds each column as a list (structure-of-arrays) in one pass,
+        so no intermediate per-match dicts exist between the match data
+        and the Parquet writer. Picks, bans and champion stats go in as
+        native list/struct values; objectives and derived features
+        become scalar columns.
+        """
+        cols = {name: [] for name in PARQUET_SCHEMA.names}
+
         for match in matches:
-            flat = {
-                'match_id': match['match_id'],
-                'patch': match['patch'],
-                'elo_rank': match['elo_rank'],
-                'blue_win': match['blue_win'],
-                
-                # Store picks/bans as JSON strings
-                'blue_picks': json.dumps(match['blue_picks']),
-                'red_picks': json.dumps(match['red_picks']),
-                'blue_bans': json.dumps(match['blue_bans']),
-                'red_bans': json.dumps(match['red_bans']),
-                
-                # Objectives
-                'blue_dragons': match['blue_objectives']['dragons'],
-                'blue_heralds': match['blue_objectives']['heralds'],
-                'blue_barons': match['blue_objectives']['barons'],
-                'blue_towers': match['blue_objectives']['towers'],
-                
-                'red_dragons': match['red_objectives']['dragons'],
-                'red_heralds': match['red_objectives']['heralds'],
-                'red_barons': match['red_objectives']['barons'],
-                'red_towers': match['red_objectives']['towers'],
-                
-                # Derived features
-                'ap_ad_ratio': match['derived_features']['ap_ad_ratio'],
-                'engage_score': match['derived_features']['engage_score'],
-                'splitpush_score': match['derived_features']['splitpush_score'],
-                'teamfight_synergy': match['derived_features']['teamfight_synergy'],
-                
-                # Champion stats as JSON string
-                'champion_stats': json.dumps(match['champion_stats'])
-            }
-            
-            flattened.append(flat)
-        
-        return flattened
+            blue_obj = match['blue_objectives']
+            red_obj = match['red_objectives']
+            features = match['derived_features']
+
+            cols['match_id'].append(match['match_id'])
+            cols['patch'].append(match['patch'])
+            cols['elo_rank'].append(match['elo_rank'])
+            cols['blue_win'].append(match['blue_win'])
+
+            cols['blue_picks'].append(match['blue_picks'])
+            cols['red_picks'].append(match['red_picks'])
+            cols['blue_bans'].append(match['blue_bans'])
+            cols['red_bans'].append(match['red_bans'])
+
+            cols['blue_dragons'].append(blue_obj['dragons'])
+            cols['blue_heralds'].append(blue_obj['heralds'])
+            cols['blue_barons'].append(blue_obj['barons'])
+            cols['blue_towers'].append(blue_obj['towers'])
+
+            cols['red_dragons'].append(red_obj['dragons'])
+            cols['red_heralds'].append(red_obj['heralds'])
+            cols['red_barons'].append(red_obj['barons'])
+            cols['red_towers'].append(red_obj['towers'])
+
+            cols['ap_ad_ratio'].append(features['ap_ad_ratio'])
+            cols['engage_score'].append(features['engage_score'])
+            cols['splitpush_score'].append(features['splitpush_score'])
+            cols['teamfight_synergy'].append(features['teamfight_synergy'])
+
+            cols['champion_stats'].append(match['champion_stats'])
+
+        arrays = [
+            pa.array(cols[field.name], type=field.type)
+            for field in PARQUET_SCHEMA
+        ]
+        return pa.Table.from_arrays(arrays, schema=PARQUET_SCHEMA)
     
     def load_matches(self, rank: str = "all", format: str = "parquet") -> List[MatchData]:
         """
@@ -194,92 +476,156 @@ class DataStorage:
             return []
     
     def _load_json(self, rank: str) -> List[MatchData]:
-        """Load matches from JSON"""
-        file_path = self.processed_path / f"matches_{rank}.json"
-        
+        """Load matches from NDJSON (falling back to legacy JSON arrays)"""
+        file_path = self.processed_path / f"matches_{rank}.ndjson"
+        with self._json_lock:
+            self._migrate_legacy_json(rank, file_path)
+
         if not file_path.exists():
             return []
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            match_dicts = json.load(f)
-        
-        matches = [MatchData(**m) for m in match_dicts]
-        return matches
+
+        loads = orjson.loads if HAS_ORJSON else json.loads
+        with open(file_path, 'rb') as f:
+            return [MatchData(**loads(line)) for line in f if line.strip()]
     
     def _load_parquet(self, rank: str) -> List[MatchData]:
-        """Load matches from Parquet"""
-        file_path = self.processed_path / f"matches_{rank}.parquet"
-        
-        if not file_path.exists():
-            return []
-        
-        df = pd.read_parquet(file_path)
-        
-        # Unflatten and convert to MatchData
+        """Load matches from Parquet (pre-shard file plus patch shards)"""
+        # Finalize any open writers so their footers are readable
+        self.close()
+
+        paths = []
+        legacy_path = self.processed_path / f"matches_{rank}.parquet"
+        if legacy_path.exists():
+            paths.append(legacy_path)
+        paths.extend(sorted(self.processed_path.glob(f"matches_{rank}_*.parquet")))
+
+        matches: List[MatchData] = []
+        for file_path in paths:
+            table = pq.read_table(file_path, columns=PARQUET_SCHEMA.names)
+            if table.schema != PARQUET_SCHEMA:
+                table = self._upgrade_legacy_table(table)
+            matches.extend(self._table_to_matches(table))
+        return matches
+
+    @staticmethod
+    def _table_to_matches(table: pa.Table) -> List[MatchData]:
+        """Rebuild MatchData rows from a schema-conformant table.
+
+        Pulls each column out once; iterating columns of Python values
+        beats df.iterrows(), which boxes every cell per row. The data
+        was written by us, so model_construct skips re-validation.
+        """
+        cols = {name: table[name].to_pylist() for name in PARQUET_SCHEMA.names}
+
         matches = []
-        for _, row in df.iterrows():
-            match_dict = self._unflatten_row(row)
-            matches.append(MatchData(**match_dict))
-        
+        for i in range(table.num_rows):
+            matches.append(MatchData.model_construct(
+                match_id=cols['match_id'][i],
+                patch=cols['patch'][i],
+                elo_rank=cols['elo_rank'][i],
+                blue_win=cols['blue_win'][i],
+                blue_picks=cols['blue_picks'][i],
+                red_picks=cols['red_picks'][i],
+                blue_bans=cols['blue_bans'][i],
+                red_bans=cols['red_bans'][i],
+                blue_objectives=Objectives.model_construct(
+                    dragons=cols['blue_dragons'][i],
+                    heralds=cols['blue_heralds'][i],
+                    barons=cols['blue_barons'][i],
+                    towers=cols['blue_towers'][i]
+                ),
+                red_objectives=Objectives.model_construct(
+                    dragons=cols['red_dragons'][i],
+                    heralds=cols['red_heralds'][i],
+                    barons=cols['red_barons'][i],
+                    towers=cols['red_towers'][i]
+                ),
+                derived_features=DerivedFeatures.model_construct(
+                    ap_ad_ratio=cols['ap_ad_ratio'][i],
+                    engage_score=cols['engage_score'][i],
+                    splitpush_score=cols['splitpush_score'][i],
+                    teamfight_synergy=cols['teamfight_synergy'][i]
+                ),
+                champion_stats=[
+                    ChampionStats.model_construct(**stats)
+                    for stats in cols['champion_stats'][i]
+                ]
+            ))
+
         return matches
     
-    def _unflatten_row(self, row: pd.Series) -> Dict:
-        """Unflatten a Parquet row back to match dictionary"""
-        return {
-            'match_id': row['match_id'],
-            'patch': row['patch'],
-            'elo_rank': row['elo_rank'],
-            'blue_win': row['blue_win'],
-            'blue_picks': json.loads(row['blue_picks']),
-            'red_picks': json.loads(row['red_picks']),
-            'blue_bans': json.loads(row['blue_bans']),
-            'red_bans': json.loads(row['red_bans']),
-            'blue_objectives': {
-                'dragons': int(row['blue_dragons']),
-                'heralds': int(row['blue_heralds']),
-                'barons': int(row['blue_barons']),
-                'towers': int(row['blue_towers'])
-            },
-            'red_objectives': {
-                'dragons': int(row['red_dragons']),
-                'heralds': int(row['red_heralds']),
-                'barons': int(row['red_barons']),
-                'towers': int(row['red_towers'])
-            },
-            'derived_features': {
-                'ap_ad_ratio': float(row['ap_ad_ratio']),
-                'engage_score': float(row['engage_score']),
-                'splitpush_score': float(row['splitpush_score']),
-                'teamfight_synergy': float(row['teamfight_synergy'])
-            },
-            'champion_stats': json.loads(row['champion_stats'])
-        }
-    
+    @staticmethod
+    def _patch_counts_from_metadata(metadata) -> Optional[Dict[str, int]]:
+        """Tally patch counts from row-group column statistics alone.
+
+        Collection batches are usually single-patch, so each row group's
+        patch min equals its max and the count is just the group's row
+        count. Returns None when any group is mixed or lacks statistics,
+        signalling the caller to decode the patch column instead.
+        """
+        try:
+            patch_idx = metadata.schema.names.index('patch')
+        except ValueError:
+            return None
+
+        counts: Dict[str, int] = {}
+        for i in range(metadata.num_row_groups):
+            group = metadata.row_group(i)
+            stats = group.column(patch_idx).statistics
+            if stats is None or not stats.has_min_max or stats.min != stats.max:
+                return None
+            counts[stats.min] = counts.get(stats.min, 0) + group.num_rows
+        return counts
+
     def get_statistics(self) -> Dict:
-        """Get statistics about stored data"""
+        """Get statistics about stored data.
+
+        Row counts come from the Parquet footer and patch counts from
+        reading just the 'patch' column, so nothing else is decoded.
+        Per-file results are memoized on mtime, making repeated calls
+        free while nothing changed on disk.
+        """
+        # Finalize any open writers so their footers are readable
+        self.close()
+
         stats = {
             'total_matches': 0,
             'by_rank': {},
             'by_patch': {}
         }
-        
+
         # Count matches in processed directory
         for file_path in self.processed_path.glob("matches_*.parquet"):
             try:
-                df = pd.read_parquet(file_path)
-                rank = file_path.stem.replace('matches_', '')
-                count = len(df)
-                
-                stats['by_rank'][rank] = count
+                mtime = file_path.stat().st_mtime
+                cached = self._stats_cache.get(file_path)
+                if cached is not None and cached[0] == mtime:
+                    count, patch_counts = cached[1], cached[2]
+                else:
+                    metadata = pq.read_metadata(file_path)
+                    count = metadata.num_rows
+                    # Row groups whose patch min == max are tallied from
+                    # the footer alone; only mixed-patch files need the
+                    # patch column decoded
+                    patch_counts = self._patch_counts_from_metadata(metadata)
+                    if patch_counts is None:
+                        patch_table = pq.read_table(file_path, columns=['patch'])
+                        patch_counts = {
+                            entry['values']: entry['counts']
+                            for entry in pc.value_counts(patch_table['patch']).to_pylist()
+                        }
+                    self._stats_cache[file_path] = (mtime, count, patch_counts)
+
+                # Shard stems look like matches_<rank>_<patch>; the
+                # pre-shard files are just matches_<rank>
+                rank = file_path.stem.replace('matches_', '').split('_')[0]
+                stats['by_rank'][rank] = stats['by_rank'].get(rank, 0) + count
                 stats['total_matches'] += count
-                
-                # Count by patch
-                if 'patch' in df.columns:
-                    patch_counts = df['patch'].value_counts().to_dict()
-                    for patch, cnt in patch_counts.items():
-                        stats['by_patch'][patch] = stats['by_patch'].get(patch, 0) + cnt
+
+                for patch, cnt in patch_counts.items():
+                    stats['by_patch'][patch] = stats['by_patch'].get(patch, 0) + cnt
             except Exception as e:
                 logger.error(f"Failed to read {file_path}: {e}")
-        
+
         return stats
 
@@ -0,0 +1,90 @@
+"""
+Persistent match cache shared by the collectors.
+
+Keyed by match_id, storing the transformed MatchData blob and its patch,
+so reruns resolve already-seen matches with a local lookup instead of
+spending Riot quota. WAL mode keeps single writes cheap and durable.
+"""
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+from ..transformers.schema import MatchData
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+logger = logging.getLogger(__name__)
+
+
+class MatchCache:
+    """SQLite-backed cache of transformed matches keyed by match_id."""
+
+    def __init__(self, cache_file: str = "data/match_cache.sqlite"):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            cache_file: Path to the SQLite cache file
+        """
+        path = Path(cache_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Shared across per-rank collection threads; the lock serializes
+        # statement execution on the single connection
+        self._conn = sqlite3.connect(
+            str(path), isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS matches "
+            "(match_id TEXT PRIMARY KEY, patch TEXT, blob BLOB)"
+        )
+
+    def get_many(self, match_ids: List[str]) -> Dict[str, MatchData]:
+        """
+        Look up previously transformed matches in one SQL round-trip.
+
+        Returns a dict of the decodable hits; missing or unreadable
+        entries are simply absent.
+        """
+        if not match_ids:
+            return {}
+
+        placeholders = ",".join("?" * len(match_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT match_id, blob FROM matches WHERE match_id IN ({placeholders})",
+                match_ids
+            ).fetchall()
+
+        hits: Dict[str, MatchData] = {}
+        for match_id, blob in rows:
+            try:
+                payload = orjson.loads(blob) if HAS_ORJSON else json.loads(blob)
+                hits[match_id] = MatchData(**payload)
+            except Exception as e:
+                logger.debug(f"Discarding unreadable cache entry for {match_id}: {e}")
+        return hits
+
+    def put(self, match_data: MatchData):
+        """Store a transformed match in the cache"""
+        payload = match_data.model_dump()
+        blob = orjson.dumps(payload) if HAS_ORJSON else json.dumps(payload).encode()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO matches (match_id, patch, blob) VALUES (?, ?, ?)",
+                (match_data.match_id, match_data.patch, blob)
+            )
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
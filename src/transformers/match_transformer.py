@@ -1,28 +1,57 @@
 """
 Transform raw Riot API match data into our standardized schema.
 """
+import json
 import logging
-from typing import Dict, List, Optional
+import sys
+from operator import itemgetter, methodcaller
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
 from .schema import MatchData, ChampionStats, Objectives, DerivedFeatures
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
+# A full set of "no ban" slots; teams missing ban data get a copy
+_SENTINEL_BANS = (-1, -1, -1, -1, -1)
+
+# C-level accessor; championId is mandatory in participant payloads
+_get_champion_id = itemgetter('championId')
+
 
 class MatchTransformer:
     """Transforms raw match data into standardized schema"""
     
-    # Role mapping for position
+    # Role mapping for position; values are interned so downstream
+    # comparisons short-circuit on pointer equality
     ROLE_MAP = {
-        'TOP': 'TOP',
-        'JUNGLE': 'JUNGLE',
-        'MIDDLE': 'MID',
-        'BOTTOM': 'ADC',
-        'UTILITY': 'SUPPORT'
+        'TOP': sys.intern('TOP'),
+        'JUNGLE': sys.intern('JUNGLE'),
+        'MIDDLE': sys.intern('MID'),
+        'BOTTOM': sys.intern('ADC'),
+        'UTILITY': sys.intern('SUPPORT')
     }
     
     def __init__(self):
         """Initialize transformer"""
-        pass
+        # Whole collection batches share one rank, so its normalized
+        # form is memoized instead of re-uppercased per match
+        self._last_rank_raw: Optional[str] = None
+        self._last_rank: str = ''
+
+    def _normalize_rank(self, elo_rank: str) -> str:
+        """Uppercase a rank once per distinct value seen"""
+        if elo_rank != self._last_rank_raw:
+            self._last_rank_raw = elo_rank
+            self._last_rank = elo_rank.upper()
+        return self._last_rank
     
     def transform(self, raw_match: Dict, elo_rank: str) -> Optional[MatchData]:
         """
@@ -34,74 +63,201 @@ class MatchTransformer:
             
         Returns:
             MatchData object or None if transformation fails
+
+        The models are assembled with ``model_construct`` — the fields are
+        computed right here, so re-running Pydantic validation on every
+        match buys nothing. Callers ingesting untrusted dictionaries
+        should go through :func:`schema.validate_match` instead.
         """
         try:
-            info = raw_match.get('info', {})
-            metadata = raw_match.get('metadata', {})
-            
-            # Extract basic info
-            match_id = metadata.get('matchId', '')
-            patch = self._extract_patch(info.get('gameVersion', ''))
-            
-            # Extract teams
-            teams = {team['teamId']: team for team in info.get('teams', [])}
-            blue_team = teams.get(100, {})
-            red_team = teams.get(200, {})
-            
-            # Extract participants
-            participants = info.get('participants', [])
-            blue_participants = [p for p in participants if p['teamId'] == 100]
-            red_participants = [p for p in participants if p['teamId'] == 200]
-            
-            # Validate we have 5v5
-            if len(blue_participants) != 5 or len(red_participants) != 5:
-                logger.warning(f"Invalid team sizes for match {match_id}")
+            prep = self._prepare(raw_match)
+            if prep is None:
                 return None
-            
-            # Extract picks and bans
-            blue_picks = [p['championId'] for p in blue_participants]
-            red_picks = [p['championId'] for p in red_participants]
-            
-            blue_bans = self._extract_bans(blue_team)
-            red_bans = self._extract_bans(red_team)
-            
-            # Determine winner
-            blue_win = blue_team.get('win', False)
-            
-            # Extract champion stats
-            champion_stats = self._extract_champion_stats(participants)
-            
-            # Extract objectives
-            blue_objectives = self._extract_objectives(blue_team.get('objectives', {}))
-            red_objectives = self._extract_objectives(red_team.get('objectives', {}))
-            
-            # Calculate derived features
-            derived_features = self._calculate_derived_features(
-                blue_participants, red_participants, info
-            )
-            
-            # Create match data
-            match_data = MatchData(
-                match_id=match_id,
-                patch=patch,
-                elo_rank=elo_rank.upper(),
-                blue_picks=blue_picks,
-                red_picks=red_picks,
-                blue_bans=blue_bans,
-                red_bans=red_bans,
-                blue_win=blue_win,
-                champion_stats=champion_stats,
-                blue_objectives=blue_objectives,
-                red_objectives=red_objectives,
-                derived_features=derived_features
+            match_id, patch, blue_team, red_team, blue_participants, red_participants = prep
+
+            champion_stats = self._extract_champion_stats(blue_participants, red_participants)
+            derived_features = self._calculate_derived_features(blue_participants)
+
+            return self._assemble(
+                match_id, patch, self._normalize_rank(elo_rank), blue_team, red_team,
+                blue_participants, red_participants, champion_stats, derived_features
             )
-            
-            return match_data
-            
+
         except Exception as e:
-            logger.error(f"Failed to transform match: {e}", exc_info=True)
+            # Tracebacks are expensive to render; only pay for them when
+            # someone is actually debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Failed to transform match", exc_info=True)
+            else:
+                logger.warning(f"Failed to transform match: {e}")
             return None
-    
+
+    def transform_from_bytes(self, raw_bytes: Union[bytes, str],
+                             elo_rank: str) -> Optional[MatchData]:
+        """
+        Transform a raw match that is still JSON text or bytes.
+
+        Decodes with orjson when available (a C parser, several times
+        faster than stdlib json on match payloads) before handing off
+        to :meth:`transform`.
+
+        Args:
+            raw_bytes: Undecoded match payload from the Riot API
+            elo_rank: Rank tier for this match
+
+        Returns:
+            MatchData object or None if decoding/transformation fails
+        """
+        try:
+            raw_match = orjson.loads(raw_bytes) if HAS_ORJSON else json.loads(raw_bytes)
+        except (ValueError, TypeError) as e:
+            logger.error(f"Failed to decode raw match payload: {e}")
+            return None
+        return self.transform(raw_match, elo_rank)
+
+    def transform_batch(self, raw_matches: List[Dict], elo_rank: str) -> List[MatchData]:
+        """
+        Transform many raw matches at once.
+
+        The numeric work — KDA, CS/min, damage/gold shares, and the
+        derived features — runs as 2-D vector ops over (n_matches, 10)
+        and (n_matches, 5) arrays, so its per-match Python overhead is
+        paid once per batch. Matches that fail structural extraction
+        are logged and dropped, mirroring transform().
+
+        Args:
+            raw_matches: Raw match payloads from the Riot API
+            elo_rank: Rank tier for these matches
+
+        Returns:
+            MatchData objects for the matches that transformed cleanly
+        """
+        elo_rank = self._normalize_rank(elo_rank)
+
+        prepared = []
+        for raw_match in raw_matches:
+            try:
+                prep = self._prepare(raw_match)
+            except Exception as e:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Failed to transform match", exc_info=True)
+                else:
+                    logger.warning(f"Failed to transform match: {e}")
+                prep = None
+            if prep is not None:
+                prepared.append(prep)
+
+        if not prepared:
+            return []
+
+        # One 2-D gather per field; each row is one match's participants
+        n = len(prepared)
+        stat = {name: np.empty((n, 10), dtype=np.float32) for name, _, _ in self._STAT_FIELDS}
+        team = {name: np.empty((n, 5), dtype=np.float32) for name, _, _ in self._TEAM_FIELDS}
+        for i, (_, _, _, _, blue, red) in enumerate(prepared):
+            participants = blue + red
+            for name, getter in self._STAT_GETTERS:
+                stat[name][i] = list(map(getter, participants))
+            for name, getter in self._TEAM_GETTERS:
+                team[name][i] = list(map(getter, blue))
+
+        kda = (stat['kills'] + stat['assists']) / np.maximum(stat['deaths'], 1.0)
+        cs_per_min = (stat['minions'] + stat['neutrals']) / np.maximum(
+            stat['time_played'] / 60.0, 1.0
+        )
+
+        dmg_share = np.empty_like(stat['damage'])
+        gold_share = np.empty_like(stat['gold'])
+        for half in (slice(0, 5), slice(5, None)):
+            dmg = stat['damage'][:, half]
+            gold = stat['gold'][:, half]
+            dmg_share[:, half] = dmg / np.maximum(dmg.sum(axis=1, keepdims=True), 1.0)
+            gold_share[:, half] = gold / np.maximum(gold.sum(axis=1, keepdims=True), 1.0)
+
+        # Derived features over the blue-team arrays, one value per match
+        magic = team['magic_damage'].sum(axis=1)
+        total_damage = magic + team['physical_damage'].sum(axis=1)
+        ap_ad_ratio = np.where(total_damage == 0, 0.5, magic / np.maximum(total_damage, 1.0))
+        engage_score = np.minimum(team['cc_time'].sum(axis=1) / 60.0 * 10, 10.0)
+        splitpush_score = np.minimum(
+            (team['structure_damage'].sum(axis=1) + team['objective_damage'].sum(axis=1))
+            / 50000.0 * 10,
+            10.0
+        )
+        kills = team['kills'].sum(axis=1)
+        teamfight_synergy = np.where(
+            kills == 0, 0.5,
+            np.minimum((team['assists'].sum(axis=1) / np.maximum(kills * 5, 1.0)) / 2, 1.0)
+        )
+
+        results = []
+        for i, (match_id, patch, blue_team, red_team, blue, red) in enumerate(prepared):
+            champion_stats = self._build_champion_stats(
+                blue + red, kda[i], cs_per_min[i], dmg_share[i], gold_share[i]
+            )
+            derived_features = DerivedFeatures.model_construct(
+                ap_ad_ratio=round(float(ap_ad_ratio[i]), 3),
+                engage_score=round(float(engage_score[i]), 3),
+                splitpush_score=round(float(splitpush_score[i]), 3),
+                teamfight_synergy=round(float(teamfight_synergy[i]), 3)
+            )
+            results.append(self._assemble(
+                match_id, patch, elo_rank, blue_team, red_team, blue, red,
+                champion_stats, derived_features
+            ))
+
+        return results
+
+    def _prepare(self, raw_match: Dict) -> Optional[tuple]:
+        """Pull the structural pieces out of a raw match.
+
+        Returns (match_id, patch, blue_team, red_team, blue_participants,
+        red_participants), or None when the match is not a full 5v5.
+        """
+        info = raw_match.get('info', {})
+        metadata = raw_match.get('metadata', {})
+
+        match_id = metadata.get('matchId', '')
+        patch = self._extract_patch(info.get('gameVersion', ''))
+
+        teams = {team['teamId']: team for team in info.get('teams', [])}
+        blue_team = teams.get(100, {})
+        red_team = teams.get(200, {})
+
+        # Partition participants by side in one pass
+        blue_participants: List[Dict] = []
+        red_participants: List[Dict] = []
+        for p in info.get('participants', []):
+            (blue_participants if p['teamId'] == 100 else red_participants).append(p)
+
+        # Validate we have 5v5
+        if len(blue_participants) != 5 or len(red_participants) != 5:
+            logger.warning(f"Invalid team sizes for match {match_id}")
+            return None
+
+        return match_id, patch, blue_team, red_team, blue_participants, red_participants
+
+    def _assemble(self, match_id: str, patch: str, elo_rank: str,
+                  blue_team: Dict, red_team: Dict,
+                  blue_participants: List[Dict], red_participants: List[Dict],
+                  champion_stats: List[ChampionStats],
+                  derived_features: DerivedFeatures) -> MatchData:
+        """Build the final MatchData from already-computed pieces"""
+        return MatchData.model_construct(
+            match_id=match_id,
+            patch=patch,
+            elo_rank=elo_rank,
+            blue_picks=list(map(_get_champion_id, blue_participants)),
+            red_picks=list(map(_get_champion_id, red_participants)),
+            blue_bans=self._extract_bans(blue_team),
+            red_bans=self._extract_bans(red_team),
+            blue_win=blue_team.get('win', False),
+            champion_stats=champion_stats,
+            blue_objectives=self._extract_objectives(blue_team.get('objectives', {})),
+            red_objectives=self._extract_objectives(red_team.get('objectives', {})),
+            derived_features=derived_features
+        )
+
     def _extract_patch(self, game_version: str) -> str:
         """Extract major.minor patch from game version"""
         try:
@@ -113,164 +269,156 @@ class MatchTransformer:
         return "unknown"
     
     def _extract_bans(self, team: Dict) -> List[int]:
-        """Extract 5 bans from team data"""
-        bans = team.get('bans', [])
-        ban_ids = [ban.get('championId', -1) for ban in bans]
-        
-        # Ensure we have exactly 5 bans (pad with -1 if needed)
-        while len(ban_ids) < 5:
-            ban_ids.append(-1)
-        
-        return ban_ids[:5]
+        """Extract exactly 5 bans from team data, padding with -1"""
+        bans = team.get('bans')
+        if not bans:
+            return list(_SENTINEL_BANS)
+
+        ban_ids = [ban.get('championId', -1) for ban in bans[:5]]
+        if len(ban_ids) < 5:
+            ban_ids.extend(_SENTINEL_BANS[len(ban_ids):])
+        return ban_ids
     
-    def _extract_champion_stats(self, participants: List[Dict]) -> List[ChampionStats]:
+    # (field name, raw participant key, default) for the SoA gather
+    _STAT_FIELDS = (
+        ('kills', 'kills', 0),
+        ('deaths', 'deaths', 0),
+        ('assists', 'assists', 0),
+        ('minions', 'totalMinionsKilled', 0),
+        ('neutrals', 'neutralMinionsKilled', 0),
+        ('time_played', 'timePlayed', 1800),
+        ('damage', 'totalDamageDealtToChampions', 0),
+        ('gold', 'goldEarned', 0),
+    )
+
+    # (field name, raw participant key, default) for the derived-feature
+    # reductions over the blue team
+    _TEAM_FIELDS = (
+        ('kills', 'kills', 0),
+        ('assists', 'assists', 0),
+        ('magic_damage', 'magicDamageDealtToChampions', 0),
+        ('physical_damage', 'physicalDamageDealtToChampions', 0),
+        ('cc_time', 'timeCCingOthers', 0),
+        ('structure_damage', 'damageDealtToBuildings', 0),
+        ('objective_damage', 'damageDealtToObjectives', 0),
+    )
+
+    # C-level bound accessors derived from the field tables; map() over
+    # these never enters a Python frame per participant
+    _STAT_GETTERS = tuple(
+        (name, methodcaller('get', key, default))
+        for name, key, default in _STAT_FIELDS
+    )
+    _TEAM_GETTERS = tuple(
+        (name, methodcaller('get', key, default))
+        for name, key, default in _TEAM_FIELDS
+    )
+
+    @staticmethod
+    def _gather_soa(participants: List[Dict], getters) -> Dict[str, np.ndarray]:
+        """Gather numeric participant fields into parallel float32 arrays.
+
+        One structure-of-arrays pass replaces the dict-lookups-per-
+        participant loops, letting the ratio, share, and reduction math
+        run as a few vector ops over short arrays.
+        """
+        n = len(participants)
+        return {
+            name: np.fromiter(map(getter, participants), dtype=np.float32, count=n)
+            for name, getter in getters
+        }
+
+    def _extract_champion_stats(self, blue_participants: List[Dict],
+                                red_participants: List[Dict]) -> List[ChampionStats]:
         """Extract stats for all champions"""
-        stats = []
-        
-        for p in participants:
-            try:
-                # Calculate KDA
-                kills = p.get('kills', 0)
-                deaths = p.get('deaths', 0)
-                assists = p.get('assists', 0)
-                kda = (kills + assists) / max(deaths, 1)
-                
-                # CS per minute
-                total_cs = p.get('totalMinionsKilled', 0) + p.get('neutralMinionsKilled', 0)
-                game_duration_minutes = p.get('timePlayed', 1800) / 60.0
-                cs_per_min = total_cs / max(game_duration_minutes, 1)
-                
-                # Role
-                role = self.ROLE_MAP.get(p.get('teamPosition', ''), 'UNKNOWN')
-                
-                stats.append(ChampionStats(
-                    id=p.get('championId', 0),
-                    role=role,
-                    kda=kda,
-                    cs=cs_per_min,
-                    dmg_share=0.0,  # Will calculate below
-                    gold_share=0.0  # Will calculate below
-                ))
-            except Exception as e:
-                logger.warning(f"Failed to extract champion stats: {e}")
-                continue
-        
-        # Calculate shares
-        self._calculate_shares(participants, stats)
-        
-        return stats
-    
-    def _calculate_shares(self, participants: List[Dict], stats: List[ChampionStats]):
-        """Calculate damage and gold shares for each team"""
-        # Group by team
-        blue_participants = [p for p in participants if p['teamId'] == 100]
-        red_participants = [p for p in participants if p['teamId'] == 200]
-        blue_stats = stats[:5]
-        red_stats = stats[5:]
-        
-        # Calculate blue team shares
-        self._calculate_team_shares(blue_participants, blue_stats)
-        
-        # Calculate red team shares
-        self._calculate_team_shares(red_participants, red_stats)
-    
-    def _calculate_team_shares(self, participants: List[Dict], stats: List[ChampionStats]):
-        """Calculate shares for a single team"""
-        total_damage = sum(p.get('totalDamageDealtToChampions', 0) for p in participants)
-        total_gold = sum(p.get('goldEarned', 0) for p in participants)
-        
-        for i, p in enumerate(participants):
-            if i < len(stats):
-                damage = p.get('totalDamageDealtToChampions', 0)
-                gold = p.get('goldEarned', 0)
-                
-                stats[i].dmg_share = damage / max(total_damage, 1)
-                stats[i].gold_share = gold / max(total_gold, 1)
+        participants = blue_participants + red_participants
+        soa = self._gather_soa(participants, self._STAT_GETTERS)
+
+        kda = (soa['kills'] + soa['assists']) / np.maximum(soa['deaths'], 1.0)
+        cs_per_min = (soa['minions'] + soa['neutrals']) / np.maximum(
+            soa['time_played'] / 60.0, 1.0
+        )
+
+        # Shares are relative to each team's totals; participants arrive
+        # pre-split, so the halves are positional
+        dmg, gold = soa['damage'], soa['gold']
+        dmg_share = np.empty_like(dmg)
+        gold_share = np.empty_like(gold)
+        for half in (slice(0, 5), slice(5, None)):
+            dmg_share[half] = dmg[half] / max(dmg[half].sum(), 1.0)
+            gold_share[half] = gold[half] / max(gold[half].sum(), 1.0)
+
+        return self._build_champion_stats(participants, kda, cs_per_min, dmg_share, gold_share)
+
+    def _build_champion_stats(self, participants: List[Dict],
+                              kda: np.ndarray, cs_per_min: np.ndarray,
+                              dmg_share: np.ndarray,
+                              gold_share: np.ndarray) -> List[ChampionStats]:
+        """Pair computed stat arrays back up with their participants.
+
+        Rounding matches the schema validators, which model_construct
+        bypasses; the inputs are non-negative by construction.
+        """
+        role_for = self.ROLE_MAP.get
+        return [
+            ChampionStats.model_construct(
+                id=p.get('championId', 0),
+                role=role_for(p.get('teamPosition', ''), 'UNKNOWN'),
+                kda=round(float(kda[i]), 2),
+                cs=round(float(cs_per_min[i]), 2),
+                dmg_share=float(dmg_share[i]),
+                gold_share=float(gold_share[i])
+            )
+            for i, p in enumerate(participants)
+        ]
     
     def _extract_objectives(self, objectives_data: Dict) -> Objectives:
         """Extract objectives from team data"""
-        return Objectives(
+        return Objectives.model_construct(
             dragons=objectives_data.get('dragon', {}).get('kills', 0),
             heralds=objectives_data.get('riftHerald', {}).get('kills', 0),
             barons=objectives_data.get('baron', {}).get('kills', 0),
             towers=objectives_data.get('tower', {}).get('kills', 0)
         )
     
-    def _calculate_derived_features(self, blue_team: List[Dict], 
-                                    red_team: List[Dict], info: Dict) -> DerivedFeatures:
+    def _calculate_derived_features(self, team: List[Dict]) -> DerivedFeatures:
         """
-        Calculate derived team composition features.
+        Calculate derived team composition features for the blue team.
         These are simplified heuristics - can be enhanced with champion data.
+
+        All seven aggregates come from one SoA gather followed by vector
+        sums, replacing the per-participant dict-accumulation loop.
         """
-        # Calculate for blue team
-        blue_ap_ad = self._calculate_ap_ad_ratio(blue_team)
-        blue_engage = self._calculate_engage_score(blue_team)
-        blue_splitpush = self._calculate_splitpush_score(blue_team)
-        blue_teamfight = self._calculate_teamfight_synergy(blue_team)
-        
-        # For now, return blue team features
-        # In production, you might want both teams' features
-        return DerivedFeatures(
-            ap_ad_ratio=blue_ap_ad,
-            engage_score=blue_engage,
-            splitpush_score=blue_splitpush,
-            teamfight_synergy=blue_teamfight
+        soa = self._gather_soa(team, self._TEAM_GETTERS)
+
+        # AP/AD ratio: magic vs physical damage dealt
+        magic_damage = float(soa['magic_damage'].sum())
+        total_damage = magic_damage + float(soa['physical_damage'].sum())
+        ap_ad_ratio = 0.5 if total_damage == 0 else magic_damage / total_damage
+
+        # Engage potential from CC time, normalized to 0-10 scale
+        engage_score = min(float(soa['cc_time'].sum()) / 60.0 * 10, 10.0)
+
+        # Splitpush potential from structure/objective damage, 0-10 scale
+        splitpush_score = min(
+            float(soa['structure_damage'].sum() + soa['objective_damage'].sum())
+            / 50000.0 * 10,
+            10.0
         )
-    
-    def _calculate_ap_ad_ratio(self, team: List[Dict]) -> float:
-        """
-        Calculate AP to AD ratio based on damage types.
-        Simplified: uses magic vs physical damage dealt.
-        """
-        total_magic = sum(p.get('magicDamageDealtToChampions', 0) for p in team)
-        total_physical = sum(p.get('physicalDamageDealtToChampions', 0) for p in team)
-        total_damage = total_magic + total_physical
-        
-        if total_damage == 0:
-            return 0.5
-        
-        return total_magic / total_damage
-    
-    def _calculate_engage_score(self, team: List[Dict]) -> float:
-        """
-        Calculate engage potential based on CC and initiation.
-        Simplified: uses CC time and total damage.
-        """
-        total_cc = sum(p.get('timeCCingOthers', 0) for p in team)
-        
-        # Normalize to 0-10 scale (rough heuristic)
-        engage_score = min(total_cc / 60.0 * 10, 10.0)
-        
-        return engage_score
-    
-    def _calculate_splitpush_score(self, team: List[Dict]) -> float:
-        """
-        Calculate splitpush potential.
-        Simplified: based on damage to objectives and structures.
-        """
-        total_structure_damage = sum(p.get('damageDealtToBuildings', 0) for p in team)
-        total_objective_damage = sum(p.get('damageDealtToObjectives', 0) for p in team)
-        
-        total = total_structure_damage + total_objective_damage
-        
-        # Normalize to 0-10 scale
-        splitpush_score = min(total / 50000.0 * 10, 10.0)
-        
-        return splitpush_score
-    
-    def _calculate_teamfight_synergy(self, team: List[Dict]) -> float:
-        """
-        Calculate teamfight synergy.
-        Simplified: based on assist participation and damage consistency.
-        """
-        total_kills = sum(p.get('kills', 0) for p in team)
-        total_assists = sum(p.get('assists', 0) for p in team)
-        
-        if total_kills == 0:
-            return 0.5
-        
+
         # High assists relative to kills indicates good teamfighting
-        synergy = min((total_assists / (total_kills * 5)) / 2, 1.0)
-        
-        return synergy
+        kills = float(soa['kills'].sum())
+        if kills == 0:
+            teamfight_synergy = 0.5
+        else:
+            teamfight_synergy = min((float(soa['assists'].sum()) / (kills * 5)) / 2, 1.0)
+
+        # round() stands in for the round_features validator that
+        # model_construct skips
+        return DerivedFeatures.model_construct(
+            ap_ad_ratio=round(ap_ad_ratio, 3),
+            engage_score=round(engage_score, 3),
+            splitpush_score=round(splitpush_score, 3),
+            teamfight_synergy=round(teamfight_synergy, 3)
+        )
 
@@ -1,5 +1,13 @@
 """
 Match data schema definition using Pydantic for validation.
+
+These models are the one schema shared by the transformer, the caches,
+and the Parquet/NDJSON storage layer. Hot paths construct them with
+``model_construct`` (no validators run) and serialize with
+``model_dump``; keep both cheap before adding fields or validators.
+A parallel set of slotted dataclasses was considered for the transform
+path and rejected — forking the schema costs more in conversion and
+drift than the per-instance dict saves.
 """
 from typing import List, Dict, Optional
 from pydantic import BaseModel, Field, validator
@@ -2,15 +2,31 @@
 Configuration management for the application.
 """
 import os
-import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any
+
+import yaml
 from dotenv import load_dotenv
 
+try:
+    # libyaml-backed parser; PyYAML only uses it when asked explicitly
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 class ConfigManager:
-    """Manages application configuration from YAML and environment variables"""
-    
+    """Manages application configuration from YAML and environment variables.
+
+    Instances are effectively read-only after __init__ — the memoized
+    dot-path cache depends on that — so attribute rebinding is blocked
+    once loading finishes, and __slots__ keeps the per-instance
+    footprint to the three declared attributes.
+    """
+
+    __slots__ = ('config_path', 'config', '_resolve_cached', '_frozen')
+
     def __init__(self, config_path: str = "config/config.yaml"):
         """
         Initialize configuration manager.
@@ -27,14 +43,27 @@ class ConfigManager:
         # Load configuration
         self._load_config()
         self._override_with_env()
+
+        # Config never changes after load, so dot-path resolution is
+        # memoized per instance; hot callers (region, rate limits) then
+        # cost a single dict hash instead of a split + nested walk
+        self._resolve_cached = lru_cache(maxsize=128)(self._resolve)
+        self._frozen = True
+
+    def __setattr__(self, name: str, value: Any):
+        if getattr(self, '_frozen', False):
+            raise AttributeError(
+                f"ConfigManager is read-only after load; cannot set {name!r}"
+            )
+        super().__setattr__(name, value)
     
     def _load_config(self):
         """Load configuration from YAML file"""
         if not self.config_path.exists():
             raise FileNotFoundError(f"Config file not found: {self.config_path}")
         
-        with open(self.config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            self.config = yaml.load(f, Loader=_YamlLoader)
     
     def _override_with_env(self):
         """Override config values with environment variables"""
@@ -58,17 +87,21 @@ class ConfigManager:
             config.get('riot_api.key')
             config.get('collection.ranks')
         """
-        keys = key_path.split('.')
+        value = self._resolve_cached(key_path)
+        return default if value is None else value
+
+    def _resolve(self, key_path: str) -> Any:
+        """Walk the nested config for a dot path; None when absent"""
         value = self.config
-        
-        for key in keys:
+
+        for key in key_path.split('.'):
             if isinstance(value, dict):
                 value = value.get(key)
                 if value is None:
-                    return default
+                    return None
             else:
-                return default
-        
+                return None
+
         return value
     
     def get_riot_api_key(self) -> str:
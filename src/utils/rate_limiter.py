@@ -1,15 +1,16 @@
 """
 Rate limiting for Riot API requests with exponential backoff.
 """
+import asyncio
 import time
 import logging
-from collections import deque
-from typing import Optional
+import threading
+from typing import List, Optional
 from functools import wraps
 from tenacity import (
     retry,
     stop_after_attempt,
-    wait_exponential,
+    wait_random_exponential,
     retry_if_exception_type
 )
 import requests
@@ -26,85 +27,202 @@ class RateLimiter:
     """
     Token bucket rate limiter for API requests.
     Handles both per-second and per-2-minute limits.
+
+    Each limit is a lazily-refilled bucket: tokens accrue at the bucket's
+    rate since the last refill (monotonic clock, so wall-clock jumps cannot
+    corrupt the budget), capped at the bucket capacity. This allows bursts
+    up to capacity instead of stalling at window boundaries.
+
+    The entire state is a handful of floats — no per-request timestamps
+    are recorded, so long backfills at full rate allocate nothing and
+    there is no history to prune on the acquire path.
     """
-    
+
     def __init__(self, requests_per_second: int = 20, requests_per_2_minutes: int = 100):
         """
         Initialize rate limiter.
-        
+
         Args:
             requests_per_second: Maximum requests per second
             requests_per_2_minutes: Maximum requests per 2 minutes
         """
         self.requests_per_second = requests_per_second
         self.requests_per_2_minutes = requests_per_2_minutes
-        
-        # Track recent requests
-        self.recent_requests = deque()  # Timestamps of requests
+
         self.second_window = 1.0
         self.two_minute_window = 120.0
-        
+
+        # Refill rates and capacities, precomputed so the per-acquire
+        # path neither divides nor converts anything
+        self._rate_1s = requests_per_second / self.second_window
+        self._rate_2m = requests_per_2_minutes / self.two_minute_window
+        self._cap_1s = float(requests_per_second)
+        self._cap_2m = float(requests_per_2_minutes)
+
+        # Buckets start full so the first burst goes straight through
+        self.tokens_1s = self._cap_1s
+        self.tokens_2m = self._cap_2m
+        self.last_refill = time.monotonic()
+
+        # Deadline before which no token is granted (server-side backoff)
+        self.penalty_until = 0.0
+
+        # Guards the bucket state; one limiter may be shared across the
+        # event loop, the save pool, and per-rank worker threads
+        self._lock = threading.Lock()
+
         logger.info(
             f"Rate limiter initialized: {requests_per_second}/sec, "
             f"{requests_per_2_minutes}/2min"
         )
-    
-    def _clean_old_requests(self):
-        """Remove timestamps older than 2 minutes"""
-        current_time = time.time()
-        cutoff_time = current_time - self.two_minute_window
-        
-        while self.recent_requests and self.recent_requests[0] < cutoff_time:
-            self.recent_requests.popleft()
-    
-    def _get_requests_in_window(self, window_seconds: float) -> int:
-        """Count requests in the specified time window"""
-        current_time = time.time()
-        cutoff_time = current_time - window_seconds
-        
-        return sum(1 for ts in self.recent_requests if ts >= cutoff_time)
-    
-    def acquire(self):
+
+    def _refill(self):
+        """Accrue tokens for the time elapsed since the last refill"""
+        now = time.monotonic()
+        gap = now - self.last_refill
+        self.last_refill = now
+
+        self.tokens_1s = min(self.tokens_1s + gap * self._rate_1s, self._cap_1s)
+        self.tokens_2m = min(self.tokens_2m + gap * self._rate_2m, self._cap_2m)
+
+    def _wait_time(self, cost: float = 1.0) -> float:
+        """Seconds until both buckets hold at least ``cost`` tokens"""
+        wait = 0.0
+        if self.tokens_1s < cost:
+            wait = max(wait, (cost - self.tokens_1s) / self._rate_1s)
+        if self.tokens_2m < cost:
+            wait = max(wait, (cost - self.tokens_2m) / self._rate_2m)
+        return wait
+
+    def _try_acquire(self, cost: float = 1.0) -> Optional[float]:
+        """Take ``cost`` tokens if possible; otherwise return seconds to wait.
+
+        Only the bucket bookkeeping runs under the lock; callers sleep
+        outside it so waiters don't serialize each other.
+        """
+        with self._lock:
+            self._refill()
+
+            now = time.monotonic()
+            if now < self.penalty_until:
+                return self.penalty_until - now
+            if self.tokens_1s >= cost and self.tokens_2m >= cost:
+                self.tokens_1s -= cost
+                self.tokens_2m -= cost
+                return None
+
+            wait_time = self._wait_time(cost)
+            if self.tokens_2m < cost:
+                logger.warning(f"2-minute rate limit reached. Waiting {wait_time:.1f}s")
+            return wait_time
+
+    def acquire(self, cost: int = 1):
         """
         Acquire permission to make a request.
         Blocks until rate limit allows the request.
+
+        Args:
+            cost: Tokens to take at once; must not exceed the smaller
+                bucket's capacity or the call can never be granted
         """
         while True:
-            self._clean_old_requests()
-            current_time = time.time()
-            
-            # Check 2-minute limit
-            requests_in_2min = len(self.recent_requests)
-            if requests_in_2min >= self.requests_per_2_minutes:
-                oldest_request = self.recent_requests[0]
-                wait_time = self.two_minute_window - (current_time - oldest_request)
-                if wait_time > 0:
-                    logger.warning(
-                        f"2-minute rate limit reached. Waiting {wait_time:.1f}s"
-                    )
-                    time.sleep(wait_time + 0.1)
-                    continue
-            
-            # Check per-second limit
-            requests_in_second = self._get_requests_in_window(self.second_window)
-            if requests_in_second >= self.requests_per_second:
-                # Wait until next second
-                time.sleep(0.1)
-                continue
-            
-            # Rate limit allows request
-            self.recent_requests.append(current_time)
-            return
-    
+            wait_time = self._try_acquire(float(cost))
+            if wait_time is None:
+                return
+            time.sleep(wait_time)
+
+    async def acquire_async(self, cost: int = 1):
+        """
+        Async counterpart of :meth:`acquire`.
+
+        Waits with ``asyncio.sleep`` so a depleted bucket parks only the
+        calling task instead of blocking the whole event loop; other
+        coroutines (and other threads' loops) keep running.
+
+        Args:
+            cost: Tokens to take at once; must not exceed the smaller
+                bucket's capacity or the call can never be granted
+        """
+        while True:
+            wait_time = self._try_acquire(float(cost))
+            if wait_time is None:
+                return
+            await asyncio.sleep(wait_time)
+
+    def acquire_batch(self, n: int) -> List[float]:
+        """
+        Reserve ``n`` tokens in one bookkeeping pass.
+
+        Instead of n acquire() calls — n lock round-trips and n
+        independently computed sleeps — the whole batch is scheduled
+        under a single lock hold. Tokens available now are scheduled
+        immediately; the remainder are spaced out at whichever bucket
+        refills slower, which is exactly when acquire() would have
+        granted them one by one.
+
+        Args:
+            n: Number of requests to schedule
+
+        Returns:
+            Monotonic timestamps (one per request, in order) before
+            which each request must not be dispatched; callers sleep
+            until their slot, e.g. ``time.sleep(max(0, t - time.monotonic()))``
+        """
+        with self._lock:
+            self._refill()
+            base = max(time.monotonic(), self.penalty_until)
+
+            t1, t2 = self.tokens_1s, self.tokens_2m
+            starts = []
+            for i in range(1, n + 1):
+                delay = 0.0
+                if i > t1:
+                    delay = (i - t1) / self._rate_1s
+                if i > t2:
+                    delay = max(delay, (i - t2) / self._rate_2m)
+                starts.append(base + delay)
+
+            # The buckets go into debt for the reserved tokens; refill
+            # pays it back by each scheduled slot, and any interleaved
+            # acquire() waits behind the reservation automatically
+            self.tokens_1s = t1 - n
+            self.tokens_2m = t2 - n
+
+        return starts
+
+    def penalty(self, retry_after: float = 1.0):
+        """
+        Suspend token grants after a server-side rate signal.
+
+        Args:
+            retry_after: Seconds to hold back, e.g. from a Retry-After header
+        """
+        with self._lock:
+            self.penalty_until = max(self.penalty_until, time.monotonic() + retry_after)
+        logger.warning(f"Rate limiter penalized for {retry_after:.1f}s")
+
+    def tokens_available(self) -> int:
+        """
+        Number of requests that could be issued right now without waiting.
+
+        Used by callers that size concurrent batches to the current budget.
+        """
+        with self._lock:
+            if time.monotonic() < self.penalty_until:
+                return 0
+            self._refill()
+            return int(min(self.tokens_1s, self.tokens_2m))
+
     def get_status(self) -> dict:
         """Get current rate limiter status"""
-        self._clean_old_requests()
-        return {
-            'requests_last_second': self._get_requests_in_window(1.0),
-            'requests_last_2min': len(self.recent_requests),
-            'limit_per_second': self.requests_per_second,
-            'limit_per_2min': self.requests_per_2_minutes
-        }
+        with self._lock:
+            self._refill()
+            return {
+                'tokens_available_1s': int(self.tokens_1s),
+                'tokens_available_2min': int(self.tokens_2m),
+                'limit_per_second': self.requests_per_second,
+                'limit_per_2min': self.requests_per_2_minutes
+            }
 
 
 def handle_rate_limit_response(response: requests.Response) -> Optional[int]:
@@ -133,9 +251,11 @@ def retry_on_rate_limit(func):
     """
     Decorator to retry API calls with exponential backoff on rate limit errors.
     """
+    # Full jitter: uniform in [0, exponential cap] so concurrent
+    # workers that hit the limit together don't retry in lockstep
     @retry(
         retry=retry_if_exception_type((RateLimitExceeded, requests.exceptions.RequestException)),
-        wait=wait_exponential(multiplier=1, min=2, max=60),
+        wait=wait_random_exponential(multiplier=1, max=60),
         stop=stop_after_attempt(5),
         reraise=True
     )
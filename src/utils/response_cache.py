@@ -0,0 +1,154 @@
+"""
+Persistent TTL cache for API response bodies.
+
+Keyed by a hash of URL plus sorted query params, storing the decoded
+JSON payload and an optional expiry. Immutable resources (match
+payloads) are stored without an expiry; slowly-changing ones (Data
+Dragon, league pages) carry a TTL. WAL mode keeps single writes cheap
+and durable, matching the other SQLite caches in this project.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from hashlib import md5
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """SQLite-backed TTL cache of JSON response bodies keyed by request."""
+
+    def __init__(self, cache_file: str = "data/response_cache.sqlite"):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            cache_file: Path to the SQLite cache file
+        """
+        path = Path(cache_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Shared across per-rank collection threads; the lock serializes
+        # statement execution on the single connection
+        self._conn = sqlite3.connect(
+            str(path), isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, body BLOB, expires REAL, "
+            "etag TEXT, last_modified TEXT)"
+        )
+        self._upgrade_schema()
+
+    def _upgrade_schema(self):
+        """Add the validator columns to databases created before them"""
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(responses)")
+        }
+        for column in ('etag', 'last_modified'):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE responses ADD COLUMN {column} TEXT")
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """Build a stable cache key for a request"""
+        payload = url
+        if params:
+            payload += '?' + json.dumps(params, sort_keys=True)
+        return md5(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached response body.
+
+        Returns the decoded payload, or None on a miss or an expired or
+        unreadable entry. Expired rows are kept — their validators let
+        :meth:`get_stale` callers revalidate instead of re-downloading —
+        and are overwritten by the next :meth:`set`.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, expires FROM responses WHERE key=?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        body, expires = row
+        if expires is not None and expires < time.time():
+            return None
+
+        try:
+            return orjson.loads(body) if HAS_ORJSON else json.loads(body)
+        except Exception as e:
+            logger.debug(f"Discarding unreadable cache entry {key}: {e}")
+            return None
+
+    def get_stale(self, key: str) -> Optional[Tuple[Any, Optional[str], Optional[str]]]:
+        """
+        Look up an entry ignoring expiry, with its HTTP validators.
+
+        Lets callers revalidate a stale body with a conditional GET
+        instead of re-downloading it.
+
+        Returns:
+            (payload, etag, last_modified), or None if absent/unreadable
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified FROM responses WHERE key=?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        try:
+            body = orjson.loads(row[0]) if HAS_ORJSON else json.loads(row[0])
+        except Exception as e:
+            logger.debug(f"Discarding unreadable cache entry {key}: {e}")
+            return None
+        return body, row[1], row[2]
+
+    def touch(self, key: str, ttl: Optional[float] = None):
+        """Refresh an entry's expiry after a 304 revalidation"""
+        expires = None if ttl is None else time.time() + ttl
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET expires=? WHERE key=?", (expires, key)
+            )
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        Store a response body.
+
+        Args:
+            key: Cache key from :meth:`make_key`
+            value: JSON-serializable payload
+            ttl: Seconds until the entry expires; None means never
+            etag: ETag response header, for later conditional GETs
+            last_modified: Last-Modified response header, likewise
+        """
+        blob = orjson.dumps(value) if HAS_ORJSON else json.dumps(value).encode()
+        expires = None if ttl is None else time.time() + ttl
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, body, expires, etag, last_modified) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, expires, etag, last_modified)
+            )
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
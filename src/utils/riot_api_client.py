@@ -1,27 +1,140 @@
 """
 Riot API client with rate limiting and error handling.
 """
+import asyncio
 import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+import httpx
 import requests
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Optional, Any
+from urllib.parse import quote, urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .rate_limiter import RateLimiter, retry_on_rate_limit
+from .response_cache import ResponseCache
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 logger = logging.getLogger(__name__)
 
 
+def _decode_json(response) -> Any:
+    """Decode a response body with orjson when available.
+
+    response.json() routes through stdlib json (and, for requests, an
+    intermediate str decode of the whole body); parsing the raw bytes
+    with orjson is several times faster on large match and timeline
+    payloads. Works for both requests and httpx responses.
+    """
+    if HAS_ORJSON:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# Stored in place of a body to remember a 404, so repeat lookups of a
+# deleted or invalid resource skip the network. Transient failures
+# (403/429/5xx) raise instead and are never cached.
+_NOT_FOUND = {'__not_found__': True}
+_NOT_FOUND_TTL = 600.0
+
+
+class _FullJitterRetry(Retry):
+    """Transport retries with full-jitter exponential backoff.
+
+    Stock urllib3 waits a deterministic backoff_factor * 2**n, so
+    concurrent workers that fail together retry together and re-collide
+    on the same overloaded endpoint. Sampling uniformly from
+    [0, deterministic wait] decorrelates them at no cost.
+    """
+
+    def get_backoff_time(self) -> float:
+        return random.uniform(0.0, super().get_backoff_time())
+
+
 class RiotAPIError(Exception):
     """Base exception for Riot API errors"""
     pass
 
 
+class _CircuitBreaker:
+    """Fail-fast breaker for one host.
+
+    During a sustained outage (e.g. a Riot patch deploy) every call
+    would otherwise walk the full transport retry ladder — up to ~30s —
+    before raising. After enough consecutive failures the breaker opens
+    and calls fail immediately for a cooldown window; the first caller
+    after the window runs a single half-open probe whose outcome closes
+    or reopens the circuit.
+    """
+
+    FAILURE_THRESHOLD = 5
+    COOLDOWN_SECONDS = 30.0
+
+    def __init__(self, host: str):
+        self._host = host
+        self._lock = threading.Lock()
+        self._state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+
+    def before_request(self):
+        """Raise immediately if the host is considered down.
+
+        Raises:
+            RiotAPIError: While the circuit is open, or while another
+                caller's half-open probe is still in flight
+        """
+        with self._lock:
+            if self._state == 'open':
+                remaining = self.COOLDOWN_SECONDS - (time.monotonic() - self._opened_at)
+                if remaining > 0:
+                    raise RiotAPIError(
+                        f"Circuit open for {self._host}, retry in {remaining:.0f}s"
+                    )
+                self._state = 'half-open'
+            elif self._state == 'half-open':
+                raise RiotAPIError(f"Circuit half-open for {self._host}, probe in flight")
+
+    def record_success(self):
+        """Any non-5xx response: the host is up, close the circuit"""
+        with self._lock:
+            self._state = 'closed'
+            self._failures = 0
+
+    def record_failure(self):
+        """A 5xx or transport failure; trip after enough in a row"""
+        with self._lock:
+            self._failures += 1
+            if self._state == 'half-open' or self._failures >= self.FAILURE_THRESHOLD:
+                if self._state != 'open':
+                    logger.warning(
+                        f"Circuit opened for {self._host} after repeated failures"
+                    )
+                self._state = 'open'
+                self._opened_at = time.monotonic()
+                self._failures = 0
+
+
 class RiotAPIClient:
     """
     Client for interacting with Riot Games API.
     Handles authentication, rate limiting, and error handling.
     """
     
-    # API endpoints
-    BASE_URLS = {
+    # API endpoints (read-only views: shared class state that nothing
+    # should mutate at runtime)
+    BASE_URLS = MappingProxyType({
         'na1': 'https://na1.api.riotgames.com',
         'euw1': 'https://euw1.api.riotgames.com',
         'eun1': 'https://eun1.api.riotgames.com',
@@ -36,10 +149,10 @@ class RiotAPIClient:
         'americas': 'https://americas.api.riotgames.com',
         'europe': 'https://europe.api.riotgames.com',
         'asia': 'https://asia.api.riotgames.com',
-    }
-    
+    })
+
     # Regional routing
-    REGIONAL_ROUTING = {
+    REGIONAL_ROUTING = MappingProxyType({
         'na1': 'americas',
         'br1': 'americas',
         'la1': 'americas',
@@ -51,29 +164,56 @@ class RiotAPIClient:
         'kr': 'asia',
         'jp1': 'asia',
         'oc1': 'asia',
-    }
-    
-    def __init__(self, api_key: str, region: str = 'na1', 
-                 rate_limiter: Optional[RateLimiter] = None):
+    })
+
+    # TTL per resource class: match payloads are immutable, Data Dragon
+    # rolls roughly daily, league pages churn constantly
+    CACHE_TTLS = (
+        ('/lol/match/v5/matches/', None),
+        ('ddragon', 3600.0),
+        ('/lol/league/', 300.0),
+    )
+
+    def __init__(self, api_key: str, region: str = 'na1',
+                 rate_limiter: Optional[RateLimiter] = None,
+                 response_cache: Optional[ResponseCache] = None):
         """
         Initialize Riot API client.
-        
+
         Args:
             api_key: Riot API key
             region: Region code (na1, euw1, kr, etc.)
             rate_limiter: Optional rate limiter instance
+            response_cache: Optional read-through cache; hits skip the
+                rate limiter and the network entirely
         """
         self.api_key = api_key
         self.region = region.lower()
         self.rate_limiter = rate_limiter or RateLimiter()
+        self.response_cache = response_cache
         
-        if self.region not in self.BASE_URLS:
-            raise ValueError(f"Invalid region: {region}")
-        
-        self.base_url = self.BASE_URLS[self.region]
-        self.regional_url = self.BASE_URLS[self.REGIONAL_ROUTING.get(self.region, 'americas')]
+        try:
+            self.base_url, self.regional_url = _REGION_URLS[self.region]
+        except KeyError:
+            raise ValueError(f"Invalid region: {region}") from None
+
+        # Endpoint prefixes resolved once for the configured region; hot
+        # getters then assemble URLs with a single concatenation instead
+        # of re-interpolating the base URL per call
+        self._summoner_by_name_url = self.base_url + '/lol/summoner/v4/summoners/by-name/'
+        self._summoner_by_id_url = self.base_url + '/lol/summoner/v4/summoners/'
+        self._summoner_by_puuid_url = self.base_url + '/lol/summoner/v4/summoners/by-puuid/'
+        self._league_entries_url = self.base_url + '/lol/league/v4/entries/'
+        self._league_url = self.base_url + '/lol/league/v4/'
+        self._match_url = self.regional_url + '/lol/match/v5/matches/'
         
-        # Session for connection pooling with retry adapter
+        # Session for connection pooling with retry adapter.
+        # Deliberately requests/HTTP1.1 rather than httpx.Client(http2=True):
+        # the threaded bulk fetches want parallel connections (one HTTP/2
+        # connection would serialize them at the TCP level), and httpx has
+        # no equivalent of urllib3's status-forcelist retry ladder below.
+        # Batch callers that benefit from multiplexing use the async
+        # client, which already negotiates HTTP/2.
         self.session = requests.Session()
         self.session.headers.update({
             'X-Riot-Token': self.api_key,
@@ -81,13 +221,13 @@ class RiotAPIClient:
         })
         
         # Configure retry strategy for connection issues
-        from requests.adapters import HTTPAdapter
-        from urllib3.util.retry import Retry
-        
-        retry_strategy = Retry(
+        # 429 is deliberately not in the forcelist: urllib3 would retry
+        # it with its own backoff, invisible to (and fighting) the
+        # shared rate limiter's Retry-After penalty
+        retry_strategy = _FullJitterRetry(
             total=5,
             backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=[500, 502, 503, 504],
             allowed_methods=["GET"]
         )
         adapter = HTTPAdapter(
@@ -97,40 +237,244 @@ class RiotAPIClient:
         )
         self.session.mount("https://", adapter)
         self.session.mount("http://", adapter)
-        
+
+        # Async clients are created lazily so sync-only callers pay
+        # nothing. Thread-local because a client is bound to the event
+        # loop of the thread that created it, and per-rank collection
+        # runs one loop per worker thread.
+        self._async_clients = threading.local()
+
+        # Single-flight map: concurrent identical requests share one
+        # network call (and one rate-limit token) instead of racing
+        self._inflight: Dict[tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        # One circuit breaker per host (platform vs regional routing),
+        # so an outage on one doesn't fail-fast calls to the other
+        self._breakers: Dict[str, _CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+
+        # Name -> summoner is stable for the life of a run; memoized per
+        # instance (same pattern as ConfigManager's resolver) so repeat
+        # lookups cost a dict hit instead of a token and a round trip
+        self._summoner_by_name_cached = lru_cache(maxsize=4096)(
+            self._fetch_summoner_by_name
+        )
+
         logger.info(f"Riot API client initialized for region: {region}")
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Get (or lazily create) this thread's shared async HTTP client."""
+        client = getattr(self._async_clients, 'client', None)
+        if client is None or client.is_closed:
+            client_kwargs = {
+                'headers': {
+                    'X-Riot-Token': self.api_key,
+                    'Accept': 'application/json'
+                },
+                'timeout': 30.0,
+                'limits': httpx.Limits(max_connections=100, max_keepalive_connections=50)
+            }
+            try:
+                # Multiplex concurrent fetches over one TLS connection
+                client = httpx.AsyncClient(http2=True, **client_kwargs)
+            except ImportError:
+                # h2 extra not installed; keep-alive HTTP/1.1 still pools
+                client = httpx.AsyncClient(**client_kwargs)
+            self._async_clients.client = client
+        return client
+
+    def _breaker_for(self, url: str) -> _CircuitBreaker:
+        """Get (or create) the circuit breaker for a URL's host"""
+        host = urlparse(url).netloc
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            with self._breakers_lock:
+                breaker = self._breakers.setdefault(host, _CircuitBreaker(host))
+        return breaker
+
+    @staticmethod
+    def _request_key(url: str, params: Optional[Dict]) -> tuple:
+        """Hashable identity of a request, for single-flight coalescing"""
+        return url, tuple(sorted(params.items())) if params else None
+
+    async def _request_async(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Make an async request, coalescing concurrent duplicates.
+
+        The first task to ask for a given (url, params) runs the fetch;
+        tasks that arrive while it is in flight await the same result,
+        so a burst of identical lookups costs one network call and one
+        rate-limit token. The in-flight map is per thread because each
+        worker thread runs its own event loop.
+        """
+        inflight = getattr(self._async_clients, 'inflight', None)
+        if inflight is None:
+            inflight = self._async_clients.inflight = {}
+
+        key = self._request_key(url, params)
+        task = inflight.get(key)
+        if task is not None:
+            return await task
+
+        task = asyncio.ensure_future(self._do_request_async(url, params))
+        inflight[key] = task
+        try:
+            return await task
+        finally:
+            inflight.pop(key, None)
+
+    async def _do_request_async(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Make an async request to the API over the shared keep-alive client.
+
+        Callers are expected to pace requests through the rate limiter
+        before dispatching a batch, so no per-call acquire happens here.
+
+        Args:
+            url: Full URL to request
+            params: Query parameters
+
+        Returns:
+            JSON response, or None for 404
+
+        Raises:
+            RiotAPIError: On API errors
+        """
+        cache_key, cache_ttl = self._cache_lookup_key(url, params)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return None if cached == _NOT_FOUND else cached
+
+        breaker = self._breaker_for(url)
+        breaker.before_request()
+        client = self._get_async_client()
+
+        try:
+            response = await client.get(url, params=params)
+
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            if response.status_code == 429:
+                # Feed the server's backoff into the limiter so every
+                # caller holds off, not just this one
+                retry_after = float(response.headers.get('Retry-After', 10))
+                self.rate_limiter.penalty(retry_after)
+                logger.error(f"Rate limit exceeded despite rate limiter (Retry-After: {retry_after:.0f}s)")
+                raise RiotAPIError("Rate limit exceeded")
+
+            if response.status_code == 404:
+                logger.debug(f"Resource not found: {url}")
+                self._cache_not_found(cache_key, cache_ttl)
+                return None
+            elif response.status_code == 403:
+                raise RiotAPIError("API key invalid or expired")
+            elif response.status_code >= 500:
+                logger.warning(f"Server error: {response.status_code}")
+                raise RiotAPIError(f"Riot API server error: {response.status_code}")
+
+            response.raise_for_status()
+            result = _decode_json(response)
+            if cache_key is not None and result is not None:
+                self.response_cache.set(cache_key, result, cache_ttl)
+            return result
+
+        except httpx.TimeoutException:
+            breaker.record_failure()
+            logger.warning(f"Request timeout: {url}")
+            raise RiotAPIError("Request timeout")
+
+        except httpx.HTTPError as e:
+            breaker.record_failure()
+            logger.error(f"Request exception: {e}")
+            raise RiotAPIError(f"Request failed: {e}")
     
     @retry_on_rate_limit
     def _request(self, url: str, params: Optional[Dict] = None) -> Dict:
+        """
+        Make a rate-limited request, coalescing concurrent duplicates.
+
+        Threaded bulk fetches can race on the same resource; the first
+        caller performs the request while followers block on its Future,
+        so the duplicate neither hits the network nor spends a token.
+        """
+        key = self._request_key(url, params)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = Future()
+                self._inflight[key] = future
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._do_request(url, params)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _do_request(self, url: str, params: Optional[Dict] = None) -> Dict:
         """
         Make a rate-limited request to the API.
-        
+
         Args:
             url: Full URL to request
             params: Query parameters
-            
+
         Returns:
             JSON response
-            
+
         Raises:
             RiotAPIError: On API errors
         """
+        cache_key, cache_ttl = self._cache_lookup_key(url, params)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return None if cached == _NOT_FOUND else cached
+
+        breaker = self._breaker_for(url)
+        breaker.before_request()
         self.rate_limiter.acquire()
-        
+
         try:
             response = self.session.get(url, params=params, timeout=30)
-            
+
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
             # Log rate limit status
             if response.status_code == 429:
-                logger.error("Rate limit exceeded despite rate limiter")
+                retry_after = float(response.headers.get('Retry-After', 10))
+                self.rate_limiter.penalty(retry_after)
+                logger.error(f"Rate limit exceeded despite rate limiter (Retry-After: {retry_after:.0f}s)")
                 raise RiotAPIError("Rate limit exceeded")
             
             response.raise_for_status()
-            return response.json()
-            
+            result = _decode_json(response)
+            if cache_key is not None and result is not None:
+                self.response_cache.set(cache_key, result, cache_ttl)
+            return result
+
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
                 logger.debug(f"Resource not found: {url}")
+                self._cache_not_found(cache_key, cache_ttl)
                 return None
             elif e.response.status_code == 403:
                 raise RiotAPIError("API key invalid or expired")
@@ -141,21 +485,56 @@ class RiotAPIClient:
                 raise RiotAPIError(f"API request failed: {e}")
         
         except requests.exceptions.Timeout:
+            breaker.record_failure()
             logger.warning(f"Request timeout: {url}")
             raise RiotAPIError("Request timeout")
-        
+
         except requests.exceptions.RequestException as e:
+            breaker.record_failure()
             logger.error(f"Request exception: {e}")
             raise RiotAPIError(f"Request failed: {e}")
     
+    def _cache_not_found(self, cache_key: Optional[str], cache_ttl: Optional[float]):
+        """Record a 404 so repeat lookups for the same resource skip the network.
+
+        Immutable resources (TTL None, i.e. match payloads) keep the
+        negative entry indefinitely — a missing match stays missing —
+        while everything else expires quickly since the resource may
+        appear later.
+        """
+        if cache_key is not None:
+            ttl = cache_ttl if cache_ttl is None else min(cache_ttl, _NOT_FOUND_TTL)
+            self.response_cache.set(cache_key, _NOT_FOUND, ttl)
+
+    def _cache_lookup_key(self, url: str, params: Optional[Dict]) -> tuple:
+        """Return (cache key, ttl) for a cacheable request, else (None, None).
+
+        Only resource classes listed in CACHE_TTLS are cached; anything
+        else always goes to the network.
+        """
+        if self.response_cache is not None:
+            for fragment, ttl in self.CACHE_TTLS:
+                if fragment in url:
+                    return ResponseCache.make_key(url, params), ttl
+        return None, None
+
     def get_summoner_by_name(self, summoner_name: str) -> Optional[Dict]:
-        """Get summoner by name"""
-        url = f"{self.base_url}/lol/summoner/v4/summoners/by-name/{summoner_name}"
+        """Get summoner by name (memoized for the life of the client)"""
+        return self._summoner_by_name_cached(summoner_name)
+
+    def _fetch_summoner_by_name(self, summoner_name: str) -> Optional[Dict]:
+        """Fetch a summoner by name; quoted so spaces and Unicode survive"""
+        url = self._summoner_by_name_url + quote(summoner_name, safe='')
         return self._request(url)
-    
+
+    def get_summoner_by_id(self, summoner_id: str) -> Optional[Dict]:
+        """Get summoner by encrypted summoner ID"""
+        url = self._summoner_by_id_url + summoner_id
+        return self._request(url)
+
     def get_summoner_by_puuid(self, puuid: str) -> Optional[Dict]:
         """Get summoner by PUUID"""
-        url = f"{self.base_url}/lol/summoner/v4/summoners/by-puuid/{puuid}"
+        url = self._summoner_by_puuid_url + puuid
         return self._request(url)
     
     def get_league_entries(self, queue: str, tier: str, division: str, 
@@ -172,24 +551,42 @@ class RiotAPIClient:
         Returns:
             List of league entries
         """
-        url = f"{self.base_url}/lol/league/v4/entries/{queue}/{tier}/{division}"
+        url = f"{self._league_entries_url}{queue}/{tier}/{division}"
         params = {'page': page}
         result = self._request(url, params)
         return result if result else []
+
+    async def get_league_entries_async(self, queue: str, tier: str, division: str,
+                                       page: int = 1) -> List[Dict]:
+        """
+        Get league entries over the shared async client.
+
+        Args:
+            queue: Queue type (RANKED_SOLO_5x5, etc.)
+            tier: Tier (IRON, BRONZE, SILVER, GOLD, PLATINUM, DIAMOND)
+            division: Division (I, II, III, IV)
+            page: Page number (1-indexed)
+
+        Returns:
+            List of league entries
+        """
+        url = f"{self._league_entries_url}{queue}/{tier}/{division}"
+        result = await self._request_async(url, {'page': page})
+        return result if result else []
     
     def get_challenger_league(self, queue: str = 'RANKED_SOLO_5x5') -> Optional[Dict]:
         """Get Challenger league"""
-        url = f"{self.base_url}/lol/league/v4/challengerleagues/by-queue/{queue}"
+        url = self._league_url + "challengerleagues/by-queue/" + queue
         return self._request(url)
     
     def get_grandmaster_league(self, queue: str = 'RANKED_SOLO_5x5') -> Optional[Dict]:
         """Get Grandmaster league"""
-        url = f"{self.base_url}/lol/league/v4/grandmasterleagues/by-queue/{queue}"
+        url = self._league_url + "grandmasterleagues/by-queue/" + queue
         return self._request(url)
     
     def get_master_league(self, queue: str = 'RANKED_SOLO_5x5') -> Optional[Dict]:
         """Get Master league"""
-        url = f"{self.base_url}/lol/league/v4/masterleagues/by-queue/{queue}"
+        url = self._league_url + "masterleagues/by-queue/" + queue
         return self._request(url)
     
     def get_match_ids_by_puuid(self, puuid: str, start: int = 0, count: int = 20,
@@ -209,7 +606,7 @@ class RiotAPIClient:
         Returns:
             List of match IDs
         """
-        url = f"{self.regional_url}/lol/match/v5/matches/by-puuid/{puuid}/ids"
+        url = self._match_url + 'by-puuid/' + puuid + '/ids'
         
         params = {'start': start, 'count': min(count, 100)}
         if queue:
@@ -221,7 +618,38 @@ class RiotAPIClient:
         
         result = self._request(url, params)
         return result if result else []
-    
+
+    async def get_match_ids_by_puuid_async(self, puuid: str, start: int = 0, count: int = 20,
+                                           queue: Optional[int] = None,
+                                           start_time: Optional[int] = None,
+                                           end_time: Optional[int] = None) -> List[str]:
+        """
+        Get match IDs for a summoner over the shared async client.
+
+        Args:
+            puuid: Player UUID
+            start: Start index
+            count: Number of matches (max 100)
+            queue: Queue ID filter (420 for ranked solo/duo)
+            start_time: Epoch timestamp (seconds)
+            end_time: Epoch timestamp (seconds)
+
+        Returns:
+            List of match IDs
+        """
+        url = self._match_url + 'by-puuid/' + puuid + '/ids'
+
+        params = {'start': start, 'count': min(count, 100)}
+        if queue:
+            params['queue'] = queue
+        if start_time:
+            params['startTime'] = start_time
+        if end_time:
+            params['endTime'] = end_time
+
+        result = await self._request_async(url, params)
+        return result if result else []
+
     def get_match(self, match_id: str) -> Optional[Dict]:
         """
         Get detailed match data.
@@ -232,68 +660,169 @@ class RiotAPIClient:
         Returns:
             Match data dictionary
         """
-        url = f"{self.regional_url}/lol/match/v5/matches/{match_id}"
+        url = self._match_url + match_id
         return self._request(url)
-    
+
+    async def get_match_async(self, match_id: str) -> Optional[Dict]:
+        """
+        Get detailed match data over the shared async client.
+
+        Args:
+            match_id: Match ID (e.g., 'NA1_4567890123')
+
+        Returns:
+            Match data dictionary
+        """
+        url = self._match_url + match_id
+        return await self._request_async(url)
+
+    def get_matches(self, match_ids: List[str], max_workers: int = 20) -> List[Optional[Dict]]:
+        """
+        Fetch many matches concurrently on the pooled sync session.
+
+        The worker count defaults to the adapter's pool_maxsize so every
+        thread reuses a kept-alive connection, and the shared rate
+        limiter still bounds global throughput — threads just overlap
+        the network waits. Failed fetches come back as None rather than
+        aborting the batch.
+
+        Args:
+            match_ids: Match IDs to fetch
+            max_workers: Upper bound on concurrent requests
+
+        Returns:
+            Match data dicts in input order, None where a fetch failed
+        """
+        if not match_ids:
+            return []
+
+        def fetch(match_id: str) -> Optional[Dict]:
+            try:
+                return self.get_match(match_id)
+            except RiotAPIError as e:
+                logger.warning(f"Failed to fetch match {match_id}: {e}")
+                return None
+
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(match_ids)),
+            thread_name_prefix='match-fetch'
+        ) as pool:
+            return list(pool.map(fetch, match_ids))
+
+    async def get_matches_async(self, match_ids: List[str]) -> List[Optional[Dict]]:
+        """
+        Fetch many matches concurrently over the shared async client.
+
+        The whole batch is scheduled with one acquire_batch() pass — one
+        lock hold instead of one per match — and each fetch sleeps until
+        its slot, so the fetches overlap on the shared connection pool
+        and a batch costs roughly one round trip instead of one per
+        match. Failed fetches come back as None rather than aborting the
+        batch.
+
+        Args:
+            match_ids: Match IDs to fetch
+
+        Returns:
+            Match data dicts in input order, None where a fetch failed
+        """
+        starts = self.rate_limiter.acquire_batch(len(match_ids))
+
+        async def fetch(match_id: str, start: float) -> Optional[Dict]:
+            delay = start - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return await self.get_match_async(match_id)
+
+        results = await asyncio.gather(
+            *(fetch(match_id, start) for match_id, start in zip(match_ids, starts)),
+            return_exceptions=True
+        )
+
+        matches: List[Optional[Dict]] = []
+        for match_id, result in zip(match_ids, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to fetch match {match_id}: {result}")
+                matches.append(None)
+            else:
+                matches.append(result)
+        return matches
+
     def get_match_timeline(self, match_id: str) -> Optional[Dict]:
         """
         Get match timeline data.
-        
+
+        Timelines are the largest payloads the client handles (tens of
+        MB); decoding runs on the raw bytes via _decode_json, so there
+        is no intermediate str copy of the body. The full dict is still
+        materialized — an iterator API over frames was considered and
+        dropped, since every current caller needs the whole timeline and
+        the payload is cached as a unit.
+
         Args:
             match_id: Match ID
-            
+
         Returns:
             Timeline data dictionary
         """
-        url = f"{self.regional_url}/lol/match/v5/matches/{match_id}/timeline"
+        url = self._match_url + match_id + '/timeline'
         return self._request(url)
     
     def get_current_patch(self) -> str:
         """
         Get current game version/patch.
-        
+
+        Resolved once per process per day; see _fetch_current_patch.
+
         Returns:
             Patch version (e.g., '14.1')
         """
-        try:
-            url = "https://ddragon.leagueoflegends.com/api/versions.json"
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            versions = response.json()
-            
-            if versions:
-                # Return major.minor (e.g., '14.1' from '14.1.1')
-                full_version = versions[0]
-                parts = full_version.split('.')
-                return f"{parts[0]}.{parts[1]}"
-            
-        except Exception as e:
-            logger.warning(f"Failed to get patch from DDragon: {e}")
-        
-        # Fallback to a reasonable recent patch
-        logger.warning("Using fallback patch version 15.21")
-        return "15.21"
+        return _fetch_current_patch(date.today().isoformat())
     
     def get_champion_data(self) -> Dict[str, Any]:
         """
         Get champion static data from Data Dragon.
-        
+
+        Memoized per patch for the life of the process; the patch lookup
+        itself is already resolved once per day, so repeated callers in
+        loops cost no network at all.
+
         Returns:
             Champion data dictionary
         """
         try:
-            patch = self.get_current_patch()
-            url = f"https://ddragon.leagueoflegends.com/cdn/{patch}.1/data/en_US/champion.json"
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            return response.json()
+            return _fetch_champion_data(self.get_current_patch())
         except Exception as e:
             logger.error(f"Failed to get champion data: {e}")
             return {}
-    
+
+    def get_champion_id_to_name_map(self) -> Dict[int, str]:
+        """
+        Get a compact champion id -> name mapping.
+
+        Most callers only need the name for an id; projecting the
+        multi-megabyte Data Dragon payload down to this map once per
+        patch lets them hold ~170 small entries instead of the full
+        blob.
+
+        Returns:
+            Mapping of numeric champion ID to champion name
+        """
+        try:
+            return _champion_id_to_name(self.get_current_patch())
+        except Exception as e:
+            logger.error(f"Failed to get champion name map: {e}")
+            return {}
+
     def close(self):
         """Close the session"""
         self.session.close()
+
+    async def aclose(self):
+        """Close this thread's async client, if one was created"""
+        client = getattr(self._async_clients, 'client', None)
+        if client is not None and not client.is_closed:
+            await client.aclose()
     
     def __enter__(self):
         return self
@@ -301,3 +830,136 @@ class RiotAPIClient:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
+
+# (platform URL, regional routing URL) per valid region, resolved once at
+# import so each __init__ is a single lookup and tuple unpack
+_REGION_URLS = MappingProxyType({
+    region: (base,
+             RiotAPIClient.BASE_URLS[RiotAPIClient.REGIONAL_ROUTING.get(region, 'americas')])
+    for region, base in RiotAPIClient.BASE_URLS.items()
+})
+
+
+# Patch version cache: one Data Dragon fetch per process per day, with a
+# local file so restarts within a day skip the network entirely
+_PATCH_CACHE_FILE = Path("data/patch.txt")
+_PATCH_MAX_AGE_SECONDS = 86400.0
+
+
+@lru_cache(maxsize=1)
+def _fetch_current_patch(today: str) -> str:
+    """Resolve the current patch, memoized per calendar day.
+
+    Args:
+        today: ISO date string; a new day invalidates the memo
+
+    Returns:
+        Patch version (e.g., '14.1')
+    """
+    try:
+        if (_PATCH_CACHE_FILE.exists()
+                and time.time() - _PATCH_CACHE_FILE.stat().st_mtime < _PATCH_MAX_AGE_SECONDS):
+            patch = _PATCH_CACHE_FILE.read_text().strip()
+            if patch:
+                return patch
+    except OSError as e:
+        logger.debug(f"Could not read patch cache file: {e}")
+
+    try:
+        url = "https://ddragon.leagueoflegends.com/api/versions.json"
+        response = requests.get(url, timeout=5)
+        response.raise_for_status()
+        versions = _decode_json(response)
+
+        if versions:
+            # Return major.minor (e.g., '14.1' from '14.1.1')
+            parts = versions[0].split('.')
+            patch = f"{parts[0]}.{parts[1]}"
+            try:
+                _PATCH_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+                _PATCH_CACHE_FILE.write_text(patch)
+            except OSError as e:
+                logger.debug(f"Could not write patch cache file: {e}")
+            return patch
+
+    except Exception as e:
+        logger.warning(f"Failed to get patch from DDragon: {e}")
+
+    # Fallback to a reasonable recent patch
+    logger.warning("Using fallback patch version 15.21")
+    return "15.21"
+
+
+# Disk cache for Data Dragon payloads; entries past the fresh window are
+# revalidated with a conditional GET rather than re-downloaded
+_DDRAGON_CACHE_FILE = "data/ddragon_cache.sqlite"
+_DDRAGON_TTL_SECONDS = 3600.0
+_ddragon_cache: Optional[ResponseCache] = None
+_ddragon_cache_lock = threading.Lock()
+
+
+def _get_ddragon_cache() -> ResponseCache:
+    """Lazily open the shared Data Dragon disk cache"""
+    global _ddragon_cache
+    with _ddragon_cache_lock:
+        if _ddragon_cache is None:
+            _ddragon_cache = ResponseCache(_DDRAGON_CACHE_FILE)
+        return _ddragon_cache
+
+
+@lru_cache(maxsize=2)
+def _fetch_champion_data(patch: str) -> Dict[str, Any]:
+    """Fetch champion static data for a patch, memoized per process.
+
+    The payload is immutable for a given patch; maxsize 2 covers a patch
+    rotation mid-run without unbounded growth. Failures raise (and are
+    handled by the caller) so a transient error is never memoized.
+
+    On disk, a fresh cached copy is served directly; a stale one is
+    revalidated with If-None-Match/If-Modified-Since so the usual answer
+    is a bodyless 304 instead of a multi-megabyte download.
+    """
+    url = f"https://ddragon.leagueoflegends.com/cdn/{patch}.1/data/en_US/champion.json"
+    cache = _get_ddragon_cache()
+    key = ResponseCache.make_key(url)
+
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    headers = {}
+    stale = cache.get_stale(key)
+    if stale is not None:
+        _, etag, last_modified = stale
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+    response = requests.get(url, timeout=5, headers=headers)
+    if response.status_code == 304 and stale is not None:
+        cache.touch(key, _DDRAGON_TTL_SECONDS)
+        return stale[0]
+
+    response.raise_for_status()
+    data = _decode_json(response)
+    cache.set(
+        key, data, ttl=_DDRAGON_TTL_SECONDS,
+        etag=response.headers.get('ETag'),
+        last_modified=response.headers.get('Last-Modified')
+    )
+    return data
+
+
+@lru_cache(maxsize=2)
+def _champion_id_to_name(patch: str) -> Dict[int, str]:
+    """Project the champion payload down to an id -> name map, per patch.
+
+    Built once from the memoized full payload; afterwards lookups touch
+    only this small dict, not the Data Dragon blob.
+    """
+    data = _fetch_champion_data(patch)
+    return {
+        int(info['key']): info['name']
+        for info in data.get('data', {}).values()
+    }
@@ -0,0 +1,46 @@
+"""
+Shared fixtures for the API test suite.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Make the project root importable regardless of where pytest is invoked
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient shared by every API test module.
+
+    Building a TestClient compiles the FastAPI route tree and resolves
+    the dependency graph; constructing it (and initializing the
+    in-memory rate limiter) once per session amortizes that across the
+    modules instead of repeating it as an import side effect in each.
+
+    The client is entered as a context manager so the app lifespan
+    actually runs — the ML routers are mounted by a background task the
+    lifespan spawns, and without it every prediction route 404s (and is
+    rewritten to 503 by DeferredRouterGuard). Before yielding we block
+    on ROUTERS_READY_EVENT via the client's portal so the first request
+    can never race the mounting.
+    """
+    from backend.api import main as api_main
+    from backend.services.rate_limit import init_rate_limiter
+
+    with TestClient(api_main.app) as test_client:
+        # Wait for the lifespan's router-load task to finish mounting
+        test_client.portal.call(api_main.ROUTERS_READY_EVENT.wait)
+
+        # The lifespan initialized the limiter from settings; re-init
+        # with the memory backend so tests never need Redis
+        init_rate_limiter(
+            redis_host="localhost",
+            redis_port=6379,
+            redis_db=0,
+            use_redis=False
+        )
+        yield test_client
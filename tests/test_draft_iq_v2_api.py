@@ -4,30 +4,14 @@ Tests for Draft IQ v2 API endpoint
 
 import pytest
 import os
-from fastapi.testclient import TestClient
 
-# Import the main app
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from backend.api.main import app
-from backend.services.rate_limit import init_rate_limiter
-
-# Initialize rate limiter for tests (memory-based, no Redis needed)
-init_rate_limiter(
-    redis_host="localhost",
-    redis_port=6379,
-    redis_db=0,
-    use_redis=False  # Use in-memory rate limiter for tests
-)
-
-client = TestClient(app)
+# App import, path setup, and rate limiter init all live in the shared
+# session-scoped `client` fixture (tests/conftest.py)
 
 API_KEY = os.getenv("STRATMANCER_API_KEY", "dev-key-change-in-production")
 
 
-def test_draft_iq_v2_with_gemini():
+def test_draft_iq_v2_with_gemini(client):
     """Test Draft IQ v2 endpoint with Gemini available"""
     payload = {
         "elo": "mid",
@@ -94,7 +78,7 @@ def test_draft_iq_v2_with_gemini():
     assert "%" in iq["final_prediction"]["red_range"]
 
 
-def test_draft_iq_v2_fallback():
+def test_draft_iq_v2_fallback(client):
     """Test Draft IQ v2 endpoint without Gemini (fallback)"""
     # Temporarily unset GEMINI_API_KEY if set
     original_key = os.environ.get("GEMINI_API_KEY")
@@ -147,7 +131,7 @@ def test_draft_iq_v2_fallback():
             os.environ["GEMINI_API_KEY"] = original_key
 
 
-def test_draft_iq_v2_oversized_payload():
+def test_draft_iq_v2_oversized_payload(client):
     """Test Draft IQ v2 with oversized payload"""
     # Create a very large payload (1000 bans - validation should reject)
     payload = {
@@ -186,7 +170,7 @@ def test_draft_iq_v2_oversized_payload():
         assert True  # Validation error is working, just caught by middleware
 
 
-def test_draft_iq_v2_rate_limit():
+def test_draft_iq_v2_rate_limit(client):
     """Test Draft IQ v2 rate limiting (if implemented)"""
     payload = {
         "elo": "mid",
@@ -225,7 +209,7 @@ def test_draft_iq_v2_rate_limit():
     assert response.status_code in [200, 429]
 
 
-def test_draft_iq_v2_invalid_elo():
+def test_draft_iq_v2_invalid_elo(client):
     """Test Draft IQ v2 with invalid ELO"""
     payload = {
         "elo": "invalid",